@@ -12,18 +12,37 @@ Deploy this agent to Agentverse for 24/7 conversation support.
 """
 
 import asyncio
+import itertools
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-import json
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from types import MappingProxyType
 import re
+import secrets
+import zlib
 
 from uagents import Agent, Context, Protocol, Model
 from uagents.setup import fund_agent_if_low
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    # Fallback to token lookups and a phrase regex when pyahocorasick is not available
+    ahocorasick = None
+    HAS_AHOCORASICK = False
+
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    # Fall back to the Aho-Corasick or stdlib scan when Hyperscan is not available
+    hyperscan = None
+    HAS_HYPERSCAN = False
+
 logger = logging.getLogger(__name__)
 
 # Agent configuration
@@ -55,12 +74,16 @@ class ConversationMessage(Model):
         if self.timestamp is None:
             self.timestamp = datetime.utcnow().isoformat()
 
+# Field names read when storing a ConversationMessage; the model is flat, so
+# asdict's recursive deep copy is unnecessary
+_MSG_FIELDS = tuple(f.name for f in fields(ConversationMessage))
+
 @dataclass
 class ConversationRequest(Model):
     """Request to start or continue a conversation."""
     user_id: str
-    session_id: Optional[str] = None
     message: str
+    session_id: Optional[str] = None
     context: Optional[Dict[str, Any]] = None
 
 @dataclass
@@ -84,43 +107,250 @@ class CrisisAlert(Model):
     recommendations: List[str]
     requires_immediate_action: bool
 
-# In-memory storage for conversations
-conversations: Dict[str, List[Dict]] = {}
-user_contexts: Dict[str, Dict] = {}
+# Messages retained per conversation; older ones are dropped on append
+MAX_CONVERSATION_MESSAGES = 50
+
+@dataclass
+class ConversationShard:
+    """Conversations and contexts for the users hashed to one shard, guarded by the shard's lock."""
+    conversations: Dict[Tuple[str, str], deque] = field(default_factory=dict)
+    user_contexts: Dict[str, Dict] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+# In-memory storage for conversations, sharded by user so concurrent requests
+# for different users do not contend on the same lock
+CONVERSATION_SHARD_COUNT = 16
+_shards = [ConversationShard() for _ in range(CONVERSATION_SHARD_COUNT)]
+
+def _shard_index(user_id: str) -> int:
+    """Return the shard a user's data lives in (stable across restarts)."""
+    return zlib.crc32(user_id.encode("utf-8")) % CONVERSATION_SHARD_COUNT
+
+def _shard_for(user_id: str) -> ConversationShard:
+    return _shards[_shard_index(user_id)]
 
 # Crisis keywords and patterns
 CRISIS_KEYWORDS = {
-    "critical": [
+    "critical": (
         "suicide", "kill myself", "end it all", "want to die", "killing myself",
         "suicide plan", "taking my life", "ending my life"
-    ],
-    "high": [
+    ),
+    "high": (
         "hopeless", "worthless", "can't go on", "no point", "give up",
         "hurt myself", "self harm", "cutting", "nobody cares"
-    ],
-    "medium": [
+    ),
+    "medium": (
         "depressed", "overwhelmed", "can't cope", "breaking down",
         "losing it", "falling apart", "desperate"
-    ],
-    "low": [
+    ),
+    "low": (
         "sad", "down", "upset", "worried", "anxious", "stressed"
-    ]
+    )
 }
 
 MOOD_INDICATORS = {
-    "positive": [
+    "positive": (
         "happy", "good", "great", "excellent", "wonderful", "amazing",
         "excited", "motivated", "optimistic", "hopeful", "grateful"
-    ],
-    "neutral": [
+    ),
+    "neutral": (
         "okay", "fine", "alright", "normal", "regular", "average"
-    ],
-    "negative": [
+    ),
+    "negative": (
         "sad", "down", "low", "bad", "terrible", "awful", "depressed",
         "anxious", "worried", "stressed", "overwhelmed", "frustrated"
-    ]
+    )
 }
 
+# Crisis levels ordered by severity; the index is the level's rank
+CRISIS_LEVELS = ("none", "low", "medium", "high", "critical")
+_CRISIS_RANK = {level: rank for rank, level in enumerate(CRISIS_LEVELS)}
+_MAX_CRISIS_RANK = len(CRISIS_LEVELS) - 1
+
+# Levels that need a follow-up, and the subset reported as a crisis
+_FOLLOWUP_LEVELS = frozenset(("critical", "high", "medium"))
+_CRISIS_DETECTED_LEVELS = frozenset(("critical", "high"))
+
+# Mood score estimated from a conversation's crisis level (1-10 scale)
+_ESTIMATED_MOOD_SCORE = {
+    "critical": 1,
+    "high": 2,
+    "medium": 3,
+    "low": 4,
+    "none": 5
+}
+
+def _build_keyword_tags() -> Dict[str, Tuple[int, Optional[Tuple[str, int]]]]:
+    """Map every crisis keyword and mood indicator to its crisis rank and mood slot."""
+    tags: Dict[str, Tuple[int, Optional[Tuple[str, int]]]] = {}
+    for level, keywords in CRISIS_KEYWORDS.items():
+        for keyword in keywords:
+            tags[keyword] = (_CRISIS_RANK[level], None)
+    # Words such as "sad" are both low-level crisis keywords and negative indicators
+    for category, indicators in MOOD_INDICATORS.items():
+        for index, indicator in enumerate(indicators):
+            rank, _ = tags.get(indicator, (0, None))
+            tags[indicator] = (rank, (category, index))
+    return tags
+
+_KEYWORD_TAGS = _build_keyword_tags()
+
+# Every keyword must start a word. Mood indicators must also end one, so
+# "sadness" is not the mood "sad", but crisis keywords keep matching inside
+# longer words such as "hopelessness" or "worthlessness" to preserve recall.
+
+def _build_keyword_automaton():
+    """Build one Aho-Corasick automaton over crisis keywords and mood indicators."""
+    if not HAS_AHOCORASICK:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, tag in _KEYWORD_TAGS.items():
+        automaton.add_word(keyword, (len(keyword), tag))
+    automaton.make_automaton()
+    return automaton
+
+# Built once at import so each message is scanned in a single linear pass
+_KEYWORD_AC = _build_keyword_automaton()
+
+def _build_keyword_patterns() -> Tuple[Tuple[str, Tuple[int, Optional[Tuple[str, int]]]], ...]:
+    """Pair each keyword's regex with the tag it reports: word-start for crisis, whole-word for mood."""
+    patterns = []
+    for keyword, (rank, mood_hit) in _KEYWORD_TAGS.items():
+        escaped = re.escape(keyword)
+        if rank:
+            patterns.append((r"\b" + escaped, (rank, None)))
+        if mood_hit is not None:
+            patterns.append((r"\b" + escaped + r"\b", (rank, mood_hit)))
+    return tuple(patterns)
+
+_KEYWORD_PATTERNS = _build_keyword_patterns()
+
+# Tags indexed by Hyperscan pattern id
+_KEYWORD_TAGS_BY_ID = tuple(tag for _, tag in _KEYWORD_PATTERNS)
+
+def _build_keyword_database():
+    """Compile every keyword pattern into one Hyperscan database, ids indexing _KEYWORD_TAGS_BY_ID."""
+    if not HAS_HYPERSCAN:
+        return None
+    
+    expressions = [expression.encode("ascii") for expression, _ in _KEYWORD_PATTERNS]
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        # Each keyword only needs reporting once per message
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+    )
+    return database
+
+# Hyperscan's \b is ASCII-only, so it is used for ASCII messages only
+_KEYWORD_HS = _build_keyword_database()
+
+def _on_keyword_match(pattern_id, start, end, flags, hits):
+    """Collect the id of each keyword Hyperscan reports."""
+    hits.append(pattern_id)
+
+# Stdlib fallback: mood indicators are found by hashing the message's tokens,
+# and crisis keywords by one regex over word starts
+_TOKEN_RE = re.compile(r"\w+")
+_CRISIS_TERMS = tuple(keyword for keyword, (rank, _) in _KEYWORD_TAGS.items() if rank)
+
+# The lookahead also reports keywords that overlap one another; at each word
+# start the highest-ranked keyword is tried first
+_CRISIS_RE = re.compile(
+    r"(?=\b(" + "|".join(
+        map(re.escape, sorted(_CRISIS_TERMS, key=lambda keyword: (-_KEYWORD_TAGS[keyword][0], -len(keyword))))
+    ) + r"))"
+)
+
+def _is_word_char(char: str) -> bool:
+    """Match the definition of a word character used by \\w in the fallback."""
+    return char.isalnum() or char == "_"
+
+# Shortest message that could possibly contain a keyword
+_MIN_KEYWORD_LEN = min(len(keyword) for keyword in _KEYWORD_TAGS)
+
+def _iter_keyword_tags(message_lower: str):
+    """
+    Yield the tag of every keyword in a lowercased message.
+    
+    A crisis keyword inside a longer word yields its crisis rank only.
+    """
+    # Replies such as "ok" or "k" cannot hold any keyword
+    if len(message_lower) < _MIN_KEYWORD_LEN:
+        return
+    
+    if _KEYWORD_HS is not None and message_lower.isascii():
+        hits: List[int] = []
+        _KEYWORD_HS.scan(message_lower.encode("ascii"), match_event_handler=_on_keyword_match, context=hits)
+        for pattern_id in hits:
+            yield _KEYWORD_TAGS_BY_ID[pattern_id]
+        return
+    
+    if _KEYWORD_AC is None:
+        for token in set(_TOKEN_RE.findall(message_lower)):
+            tag = _KEYWORD_TAGS.get(token)
+            if tag is not None:
+                yield tag
+        for match in _CRISIS_RE.finditer(message_lower):
+            yield _KEYWORD_TAGS[match.group(1)][0], None
+        return
+    
+    last = len(message_lower) - 1
+    for end, (length, tag) in _KEYWORD_AC.iter(message_lower):
+        start = end - length + 1
+        if start > 0 and _is_word_char(message_lower[start - 1]):
+            continue
+        if end < last and _is_word_char(message_lower[end + 1]):
+            # Inside a longer word, such as "sad" in "sadness", only a crisis rank counts
+            if tag[0]:
+                yield tag[0], None
+            continue
+        yield tag
+
+# Short turns such as "hi" or "thanks" repeat often; longer messages rarely do
+# and are not cached, which bounds the memory the cache can hold
+ANALYSIS_CACHE_SIZE = 4096
+_CACHEABLE_MESSAGE_LEN = 256
+
+def _scan_message(message_lower: str) -> Tuple[str, Mapping[str, Tuple[str, ...]]]:
+    """Scan a lowercased message once for its crisis level and mood indicators."""
+    best = 0
+    mood_hits = set()
+    for rank, mood_hit in _iter_keyword_tags(message_lower):
+        if rank > best:
+            best = rank
+        if mood_hit is not None:
+            mood_hits.add(mood_hit)
+    
+    found_indicators = {"positive": [], "neutral": [], "negative": []}
+    # Report indicators in declaration order, each at most once
+    for category, index in sorted(mood_hits):
+        found_indicators[category].append(MOOD_INDICATORS[category][index])
+    
+    # Read-only so a cached result can be shared between requests
+    return CRISIS_LEVELS[best], MappingProxyType(
+        {category: tuple(indicators) for category, indicators in found_indicators.items()}
+    )
+
+_scan_message_cached = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(_scan_message)
+
+def analyze_message(message_lower: str) -> Tuple[str, Mapping[str, Tuple[str, ...]]]:
+    """
+    Detect crisis level and mood indicators in a single scan of the message.
+    
+    Args:
+        message_lower: Lowercased user message to analyze
+        
+    Returns:
+        Tuple of crisis level and read-only mapping of mood categories to found indicators
+    """
+    if len(message_lower) <= _CACHEABLE_MESSAGE_LEN:
+        return _scan_message_cached(message_lower)
+    return _scan_message(message_lower)
+
 def detect_crisis_level(message: str) -> str:
     """
     Detect crisis level from message content.
@@ -131,31 +361,17 @@ def detect_crisis_level(message: str) -> str:
     Returns:
         Crisis level: critical, high, medium, low, or none
     """
-    message_lower = message.lower()
-    
-    # Check for critical keywords first
-    for keyword in CRISIS_KEYWORDS["critical"]:
-        if keyword in message_lower:
-            return "critical"
-    
-    # Check for high-risk keywords
-    for keyword in CRISIS_KEYWORDS["high"]:
-        if keyword in message_lower:
-            return "high"
-    
-    # Check for medium-risk keywords
-    for keyword in CRISIS_KEYWORDS["medium"]:
-        if keyword in message_lower:
-            return "medium"
+    best = 0
+    for rank, _ in _iter_keyword_tags(message.lower()):
+        if rank > best:
+            best = rank
+            # Nothing outranks critical, so the rest of the message can be skipped
+            if best == _MAX_CRISIS_RANK:
+                break
     
-    # Check for low-risk keywords
-    for keyword in CRISIS_KEYWORDS["low"]:
-        if keyword in message_lower:
-            return "low"
-    
-    return "none"
+    return CRISIS_LEVELS[best]
 
-def extract_mood_indicators(message: str) -> Dict[str, List[str]]:
+def extract_mood_indicators(message: str) -> Mapping[str, Tuple[str, ...]]:
     """
     Extract mood indicators from message.
     
@@ -163,17 +379,82 @@ def extract_mood_indicators(message: str) -> Dict[str, List[str]]:
         message: User message to analyze
         
     Returns:
-        Dictionary with mood categories and found indicators
+        Read-only mapping of mood categories to found indicators
     """
-    message_lower = message.lower()
-    found_indicators = {"positive": [], "neutral": [], "negative": []}
-    
-    for category, indicators in MOOD_INDICATORS.items():
-        for indicator in indicators:
-            if indicator in message_lower:
-                found_indicators[category].append(indicator)
-    
-    return found_indicators
+    return analyze_message(message.lower())[1]
+
+# Recommendations per (crisis level, positive mood detected); only "none" depends on mood
+_LEVEL_RECOMMENDATIONS = {
+    "critical": (
+        "immediate_crisis_intervention",
+        "emergency_services_contact",
+        "crisis_hotline_988",
+        "trusted_person_contact"
+    ),
+    "high": (
+        "professional_mental_health_support",
+        "crisis_support_line",
+        "safety_planning",
+        "trusted_friend_family_contact"
+    ),
+    "medium": (
+        "mental_health_professional_consultation",
+        "coping_strategies_practice",
+        "support_group_consideration",
+        "self_care_routine"
+    ),
+    "low": (
+        "mood_tracking",
+        "stress_management_techniques",
+        "physical_activity",
+        "social_connection"
+    )
+}
+
+RECOMMENDATIONS_BY_LEVEL: Dict[Tuple[str, bool], Tuple[str, ...]] = {
+    (level, positive): recommendations
+    for level, recommendations in _LEVEL_RECOMMENDATIONS.items()
+    for positive in (False, True)
+}
+RECOMMENDATIONS_BY_LEVEL[("none", True)] = (
+    "maintain_positive_habits",
+    "gratitude_practice",
+    "share_positivity_with_others"
+)
+RECOMMENDATIONS_BY_LEVEL[("none", False)] = (
+    "daily_mood_check_in",
+    "mindfulness_practice",
+    "healthy_lifestyle_maintenance"
+)
+
+# Empathetic replies per crisis level; the first option is used
+_RESPONSES: Dict[str, Tuple[str, ...]] = {
+    "critical": (
+        "I'm very concerned about what you're sharing with me. Your life has value and meaning. Please reach out to a crisis helpline immediately at 988 (Suicide & Crisis Lifeline) or go to your nearest emergency room.",
+        "What you're feeling right now is incredibly difficult, but you don't have to face this alone. Please contact emergency services or a trusted person right away. You matter, and there is help available."
+    ),
+    "high": (
+        "I hear how much pain you're in right now, and I want you to know that these feelings, while overwhelming, can change. Have you considered talking to a mental health professional or calling a crisis support line?",
+        "It sounds like you're going through an incredibly difficult time. You're not alone in this - many people have felt this way and found their way through with support. Can we explore some immediate coping strategies?"
+    ),
+    "medium": (
+        "I can sense that you're struggling right now, and that takes courage to share. These feelings are valid, and it's okay to not be okay sometimes. What has helped you cope with difficult emotions in the past?",
+        "Thank you for trusting me with how you're feeling. Depression and overwhelm can feel all-consuming, but they don't define you. Would you like to talk about what's been most challenging lately?"
+    ),
+    "low": (
+        "I hear that you're having a tough time. It's completely normal to feel this way sometimes. Sometimes just acknowledging these feelings can be the first step. What's been on your mind today?",
+        "Everyone goes through difficult periods, and it sounds like you're in one right now. I'm here to listen and support you through this. Would you like to share more about what's been affecting your mood?"
+    ),
+    "none": (
+        "Thank you for sharing with me. I'm here to listen and provide support. How are you feeling today, and what would be most helpful for our conversation?",
+        "I appreciate you taking the time to connect. Mental wellness is a journey, and I'm here to support you along the way. What's on your mind?"
+    )
+}
+
+_POSITIVE_RESPONSE = (
+    "It's wonderful to hear the positive energy in your message! I noticed you mentioned feeling {}. "
+    "This is great - would you like to talk about what's contributing to these good feelings?"
+)
 
 def generate_empathetic_response(message: str, crisis_level: str, mood_indicators: Dict) -> str:
     """
@@ -187,37 +468,12 @@ def generate_empathetic_response(message: str, crisis_level: str, mood_indicator
     Returns:
         Empathetic response text
     """
-    responses = {
-        "critical": [
-            "I'm very concerned about what you're sharing with me. Your life has value and meaning. Please reach out to a crisis helpline immediately at 988 (Suicide & Crisis Lifeline) or go to your nearest emergency room.",
-            "What you're feeling right now is incredibly difficult, but you don't have to face this alone. Please contact emergency services or a trusted person right away. You matter, and there is help available."
-        ],
-        "high": [
-            "I hear how much pain you're in right now, and I want you to know that these feelings, while overwhelming, can change. Have you considered talking to a mental health professional or calling a crisis support line?",
-            "It sounds like you're going through an incredibly difficult time. You're not alone in this - many people have felt this way and found their way through with support. Can we explore some immediate coping strategies?"
-        ],
-        "medium": [
-            "I can sense that you're struggling right now, and that takes courage to share. These feelings are valid, and it's okay to not be okay sometimes. What has helped you cope with difficult emotions in the past?",
-            "Thank you for trusting me with how you're feeling. Depression and overwhelm can feel all-consuming, but they don't define you. Would you like to talk about what's been most challenging lately?"
-        ],
-        "low": [
-            "I hear that you're having a tough time. It's completely normal to feel this way sometimes. Sometimes just acknowledging these feelings can be the first step. What's been on your mind today?",
-            "Everyone goes through difficult periods, and it sounds like you're in one right now. I'm here to listen and support you through this. Would you like to share more about what's been affecting your mood?"
-        ],
-        "none": [
-            "Thank you for sharing with me. I'm here to listen and provide support. How are you feeling today, and what would be most helpful for our conversation?",
-            "I appreciate you taking the time to connect. Mental wellness is a journey, and I'm here to support you along the way. What's on your mind?"
-        ]
-    }
+    # Positive words only change the reply when no crisis language was found
+    if crisis_level == "none" and mood_indicators["positive"]:
+        return _POSITIVE_RESPONSE.format(", ".join(mood_indicators["positive"][:2]))
     
-    # Add mood-specific responses
-    if mood_indicators["positive"]:
-        if crisis_level == "none":
-            return f"It's wonderful to hear the positive energy in your message! I noticed you mentioned feeling {', '.join(mood_indicators['positive'][:2])}. This is great - would you like to talk about what's contributing to these good feelings?"
-    
-    # Select appropriate response based on crisis level
-    response_options = responses.get(crisis_level, responses["none"])
-    return response_options[0]  # Return first option for consistency
+    # Return first option for consistency
+    return _RESPONSES.get(crisis_level, _RESPONSES["none"])[0]
 
 def generate_recommendations(message: str, crisis_level: str, mood_indicators: Dict) -> List[str]:
     """
@@ -231,84 +487,53 @@ def generate_recommendations(message: str, crisis_level: str, mood_indicators: D
     Returns:
         List of recommendations
     """
-    recommendations = []
-    
-    if crisis_level == "critical":
-        recommendations.extend([
-            "immediate_crisis_intervention",
-            "emergency_services_contact",
-            "crisis_hotline_988",
-            "trusted_person_contact"
-        ])
-    elif crisis_level == "high":
-        recommendations.extend([
-            "professional_mental_health_support",
-            "crisis_support_line",
-            "safety_planning",
-            "trusted_friend_family_contact"
-        ])
-    elif crisis_level == "medium":
-        recommendations.extend([
-            "mental_health_professional_consultation",
-            "coping_strategies_practice",
-            "support_group_consideration",
-            "self_care_routine"
-        ])
-    elif crisis_level == "low":
-        recommendations.extend([
-            "mood_tracking",
-            "stress_management_techniques",
-            "physical_activity",
-            "social_connection"
-        ])
-    else:
-        # Positive or neutral mood
-        if mood_indicators["positive"]:
-            recommendations.extend([
-                "maintain_positive_habits",
-                "gratitude_practice",
-                "share_positivity_with_others"
-            ])
-        else:
-            recommendations.extend([
-                "daily_mood_check_in",
-                "mindfulness_practice",
-                "healthy_lifestyle_maintenance"
-            ])
-    
-    return recommendations
+    positive = bool(mood_indicators["positive"])
+    recommendations = RECOMMENDATIONS_BY_LEVEL.get(
+        (crisis_level, positive), RECOMMENDATIONS_BY_LEVEL[("none", positive)]
+    )
+    return list(recommendations)
 
-def store_conversation_message(user_id: str, session_id: str, message_data: Dict) -> None:
+async def store_conversation_message(user_id: str, session_id: str, message_data: Dict) -> None:
     """Store conversation message in memory."""
-    conversation_key = f"{user_id}_{session_id}"
-    
-    if conversation_key not in conversations:
-        conversations[conversation_key] = []
-    
-    conversations[conversation_key].append(message_data)
+    await store_conversation_messages(user_id, session_id, (message_data,))
+
+async def store_conversation_messages(user_id: str, session_id: str, messages: Sequence[Dict]) -> None:
+    """Store several conversation messages in memory with one lookup."""
+    conversation_key = (user_id, session_id)
+    shard = _shard_for(user_id)
     
-    # Keep only last 50 messages per conversation
-    if len(conversations[conversation_key]) > 50:
-        conversations[conversation_key] = conversations[conversation_key][-50:]
+    async with shard.lock:
+        shard.conversations.setdefault(
+            conversation_key, deque(maxlen=MAX_CONVERSATION_MESSAGES)
+        ).extend(messages)
     
-    logger.info(f"Stored message for conversation {conversation_key}")
+    logger.info("Stored %d messages for conversation %s_%s", len(messages), user_id, session_id)
 
 def get_conversation_history(user_id: str, session_id: str, limit: int = 10) -> List[Dict]:
     """Get conversation history."""
-    conversation_key = f"{user_id}_{session_id}"
+    conversation_key = (user_id, session_id)
     
-    if conversation_key not in conversations:
+    history = _shard_for(user_id).conversations.get(conversation_key)
+    if not history:
         return []
     
-    return conversations[conversation_key][-limit:]
+    return list(itertools.islice(history, max(0, len(history) - limit), None))
 
-def update_user_context(user_id: str, context_update: Dict) -> None:
-    """Update user context information."""
-    if user_id not in user_contexts:
-        user_contexts[user_id] = {}
+async def update_user_context(
+    user_id: str,
+    context_update: Dict,
+    new_conversation: bool = False,
+    now_iso: Optional[str] = None,
+) -> None:
+    """Update user context information, optionally counting a new conversation turn."""
+    shard = _shard_for(user_id)
     
-    user_contexts[user_id].update(context_update)
-    user_contexts[user_id]["last_updated"] = datetime.utcnow().isoformat()
+    async with shard.lock:
+        user_context = shard.user_contexts.setdefault(user_id, {})
+        user_context.update(context_update)
+        if new_conversation:
+            user_context["conversation_count"] = user_context.get("conversation_count", 0) + 1
+        user_context["last_updated"] = now_iso or datetime.utcnow().isoformat()
 
 # Create conversation protocol
 conversation_protocol = Protocol("Conversation Coordination Protocol")
@@ -324,14 +549,17 @@ async def handle_conversation_request(ctx: Context, sender: str, msg: Conversati
         msg: Conversation request
     """
     try:
-        ctx.logger.info(f"Received conversation request from {sender} for user {msg.user_id}")
+        ctx.logger.info("Received conversation request from %s for user %s", sender, msg.user_id)
+        
+        # One clock reading serves every timestamp in this request
+        now_iso = datetime.utcnow().isoformat()
         
-        # Generate session ID if not provided
-        session_id = msg.session_id or f"session_{int(datetime.utcnow().timestamp())}"
+        # Generate session ID if not provided; random so same-second requests never share one
+        session_id = msg.session_id or f"session_{secrets.token_hex(8)}"
         
         # Analyze the message for crisis and mood indicators
-        crisis_level = detect_crisis_level(msg.message)
-        mood_indicators = extract_mood_indicators(msg.message)
+        message_lower = msg.message.lower()
+        crisis_level, mood_indicators = analyze_message(message_lower)
         
         # Generate empathetic response
         response_text = generate_empathetic_response(msg.message, crisis_level, mood_indicators)
@@ -343,7 +571,7 @@ async def handle_conversation_request(ctx: Context, sender: str, msg: Conversati
         user_message_data = {
             "message": msg.message,
             "message_type": "user",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now_iso,
             "crisis_level": crisis_level,
             "mood_indicators": mood_indicators
         }
@@ -351,39 +579,31 @@ async def handle_conversation_request(ctx: Context, sender: str, msg: Conversati
         assistant_message_data = {
             "message": response_text,
             "message_type": "assistant", 
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now_iso,
             "recommendations": recommendations
         }
         
-        store_conversation_message(msg.user_id, session_id, user_message_data)
-        store_conversation_message(msg.user_id, session_id, assistant_message_data)
+        await store_conversation_messages(
+            msg.user_id, session_id, (user_message_data, assistant_message_data)
+        )
         
         # Update user context
         context_update = {
             "last_crisis_level": crisis_level,
-            "last_mood_indicators": mood_indicators,
-            "conversation_count": user_contexts.get(msg.user_id, {}).get("conversation_count", 0) + 1
+            "last_mood_indicators": mood_indicators
         }
-        update_user_context(msg.user_id, context_update)
+        await update_user_context(msg.user_id, context_update, new_conversation=True, now_iso=now_iso)
         
         # Determine if follow-up is needed
-        requires_followup = crisis_level in ["critical", "high", "medium"]
-        crisis_detected = crisis_level in ["critical", "high"]
+        requires_followup = crisis_level in _FOLLOWUP_LEVELS
+        crisis_detected = crisis_level in _CRISIS_DETECTED_LEVELS
         
         # Create mood assessment for mood tracker
         mood_assessment = None
         if mood_indicators["negative"] or crisis_level != "none":
-            estimated_mood_score = {
-                "critical": 1,
-                "high": 2,
-                "medium": 3,
-                "low": 4,
-                "none": 5
-            }.get(crisis_level, 5)
-            
             mood_assessment = {
-                "estimated_mood_score": estimated_mood_score,
-                "emotions": mood_indicators["negative"] + mood_indicators["positive"],
+                "estimated_mood_score": _ESTIMATED_MOOD_SCORE.get(crisis_level, 5),
+                "emotions": [*mood_indicators["negative"], *mood_indicators["positive"]],
                 "crisis_level": crisis_level,
                 "needs_intervention": crisis_detected
             }
@@ -414,19 +634,19 @@ async def handle_conversation_request(ctx: Context, sender: str, msg: Conversati
             )
             
             # In a real deployment, this would be sent to crisis management systems
-            ctx.logger.critical(f"CRISIS ALERT: {crisis_level} level crisis detected for user {msg.user_id}")
+            ctx.logger.critical("CRISIS ALERT: %s level crisis detected for user %s", crisis_level, msg.user_id)
             
             # TODO: Send to crisis management agent or external emergency systems
         
-        ctx.logger.info(f"Processed conversation for user {msg.user_id}, crisis level: {crisis_level}")
+        ctx.logger.info("Processed conversation for user %s, crisis level: %s", msg.user_id, crisis_level)
         
     except Exception as e:
-        ctx.logger.error(f"Error processing conversation request: {str(e)}")
+        ctx.logger.error("Error processing conversation request: %s", e)
         
         # Send error response
         error_response = ConversationResponse(
             user_id=msg.user_id,
-            session_id=msg.session_id or "error_session",
+            session_id=msg.session_id or f"session_{secrets.token_hex(8)}",
             response="I apologize, but I'm experiencing technical difficulties. Please try again, or if this is urgent, please contact emergency services or a crisis helpline.",
             recommendations=["retry_conversation", "emergency_contact_if_urgent"],
             requires_followup=True,
@@ -445,16 +665,16 @@ async def handle_conversation_message(ctx: Context, sender: str, msg: Conversati
         msg: Conversation message
     """
     try:
-        ctx.logger.info(f"Received conversation message from {sender}")
+        ctx.logger.info("Received conversation message from %s", sender)
         
         # Store the message
-        message_data = asdict(msg)
-        store_conversation_message(msg.user_id, msg.session_id, message_data)
+        message_data = {name: getattr(msg, name) for name in _MSG_FIELDS}
+        await store_conversation_message(msg.user_id, msg.session_id, message_data)
         
-        ctx.logger.info(f"Stored message for user {msg.user_id} in session {msg.session_id}")
+        ctx.logger.info("Stored message for user %s in session %s", msg.user_id, msg.session_id)
         
     except Exception as e:
-        ctx.logger.error(f"Error handling conversation message: {str(e)}")
+        ctx.logger.error("Error handling conversation message: %s", e)
 
 # Include the conversation protocol in the agent
 conversation_coordinator.include(conversation_protocol)
@@ -463,7 +683,7 @@ conversation_coordinator.include(conversation_protocol)
 async def startup_handler(ctx: Context):
     """Agent startup handler."""
     ctx.logger.info("💬 Mental Wellness Conversation Coordinator Agent starting up...")
-    ctx.logger.info(f"Agent address: {conversation_coordinator.address}")
+    ctx.logger.info("Agent address: %s", conversation_coordinator.address)
     ctx.logger.info("Ready to provide empathetic conversation support!")
 
 @conversation_coordinator.on_event("shutdown")
@@ -472,6 +692,9 @@ async def shutdown_handler(ctx: Context):
     ctx.logger.info("💬 Mental Wellness Conversation Coordinator Agent shutting down...")
 
 if __name__ == "__main__":
+    # Configure logging only when run as a script so importers keep their own setup
+    logging.basicConfig(level=logging.INFO)
+    
     print("🚀 Starting Mental Wellness Conversation Coordinator Agent for Agentverse...")
     print(f"💬 Agent Address: {conversation_coordinator.address}")
     print(f"🌐 Port: {COORDINATOR_PORT}")
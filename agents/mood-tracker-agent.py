@@ -12,23 +12,65 @@ Deploy this agent to Agentverse for 24/7 mood tracking services.
 """
 
 import asyncio
+import base64
+import bisect
+import hashlib
+import itertools
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-import json
+import mmap
+import os
+import struct
+import zlib
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+import re
+import time
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
 
 from uagents import Agent, Context, Protocol, Model
 from uagents.setup import fund_agent_if_low
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    # Fallback to a precompiled alternation regex when pyahocorasick is not available
+    ahocorasick = None
+    HAS_AHOCORASICK = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    # Fallback to vectorized NumPy statistics when Numba is not available
+    njit = None
+    HAS_NUMBA = False
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    # Mood logs stay disabled when cryptography is not available
+    InvalidTag = None
+    AESGCM = None
+    HAS_CRYPTOGRAPHY = False
+
 logger = logging.getLogger(__name__)
 
 # Agent configuration
 MOOD_TRACKER_SEED = "mood_tracker_wellness_coach_seed_phrase_here"
 MOOD_TRACKER_PORT = 8000
 MOOD_TRACKER_ENDPOINT = ["http://127.0.0.1:8000/submit"]
+# Per-user reading logs are opt-in: they are only written when both a
+# directory and a base64-encoded AES key (16, 24 or 32 bytes) are configured
+MOOD_LOG_DIR = os.getenv("MOOD_LOG_DIR")
+MOOD_LOG_KEY = os.getenv("MOOD_LOG_KEY")
 
 # Create the mood tracker agent
 mood_tracker = Agent(
@@ -52,12 +94,12 @@ class MoodReading(Model):
     sleep_hours: Optional[float] = None
     triggers: Optional[List[str]] = None
     notes: Optional[str] = None
-    timestamp: Optional[str] = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.utcnow().isoformat()
+    timestamp: Optional[str] = None  # ISO timestamp supplied by the sender
 
+@dataclass
+class MoodLogEntry(MoodReading):
+    """Mood reading to store without analysis; analysis can be requested later."""
+    
 @dataclass
 class MoodAnalysisRequest(Model):
     """Request for mood analysis."""
@@ -84,221 +126,888 @@ class MoodEntryResponse(Model):
     recommendations: List[str]
     alerts: List[str]
 
-# In-memory storage for mood data (in production, use persistent storage)
-mood_history: Dict[str, List[Dict]] = {}
-mood_patterns: Dict[str, Dict] = {}
-
-# Alert thresholds
-ALERT_THRESHOLDS = {
-    "low_mood_threshold": 3,
-    "consecutive_low_days": 3,
-    "stress_threshold": 7,
-    "energy_threshold": 2,
-    "crisis_keywords": [
-        "suicide", "kill myself", "end it all", "hopeless", "worthless",
-        "can't go on", "no point", "give up", "hurt myself"
-    ]
-}
+# Number of readings retained per user and used for short-term trend analysis
+MAX_READINGS_PER_USER = 100
+RECENT_READINGS_WINDOW = 7
+
+@dataclass
+class MoodBuffer:
+    """
+    Fixed-capacity struct-of-arrays ring buffer of a user's mood readings.
+    
+    Scores live in contiguous int8 arrays so trend math runs as vectorized
+    NumPy operations. Missing stress/energy levels are stored as -1 and
+    emotions as a uint64 bitmap (see encode_emotions). Running score
+    tallies are kept in step with evictions.
+    """
+    capacity: int = MAX_READINGS_PER_USER
+    head: int = 0  # write cursor; the oldest reading is at head % capacity once full
+    score_sum: int = 0
+    low_count: int = 0
+    high_count: int = 0
+    scores: np.ndarray = field(init=False, repr=False)
+    stress: np.ndarray = field(init=False, repr=False)
+    energy: np.ndarray = field(init=False, repr=False)
+    emotions: np.ndarray = field(init=False, repr=False)
+    timestamps: np.ndarray = field(init=False, repr=False)  # epoch seconds
+    
+    def __post_init__(self):
+        self.scores = np.zeros(self.capacity, dtype=np.int8)
+        self.stress = np.full(self.capacity, -1, dtype=np.int8)
+        self.energy = np.full(self.capacity, -1, dtype=np.int8)
+        self.emotions = np.zeros(self.capacity, dtype=np.uint64)
+        self.timestamps = np.zeros(self.capacity, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return min(self.head, self.capacity)
+    
+    def _tally(self, score: int, sign: int) -> None:
+        self.score_sum += sign * score
+        if score <= LOW_MOOD_THR:
+            self.low_count += sign
+        if score >= HIGH_MOOD_THR:
+            self.high_count += sign
+    
+    def append(self, mood_score: int, stress_level: Optional[int],
+               energy_level: Optional[int], timestamp: int, emotion_bits: int = 0) -> None:
+        """Write a reading into the next slot, evicting the oldest when full."""
+        if self.head and timestamp < self.timestamps[(self.head - 1) % self.capacity]:
+            self._insert_ordered(mood_score, stress_level, energy_level, timestamp, emotion_bits)
+            return
+        
+        slot = self.head % self.capacity
+        if self.head >= self.capacity:
+            self._tally(int(self.scores[slot]), -1)
+        
+        self.scores[slot] = mood_score
+        self.stress[slot] = -1 if stress_level is None else stress_level
+        self.energy[slot] = -1 if energy_level is None else energy_level
+        self.emotions[slot] = emotion_bits
+        self.timestamps[slot] = timestamp
+        self._tally(mood_score, 1)
+        self.head += 1
+    
+    def _insert_ordered(self, mood_score: int, stress_level: Optional[int],
+                        energy_level: Optional[int], timestamp: int, emotion_bits: int) -> None:
+        """
+        Insert a back-dated reading at its timestamp position.
+        
+        Timestamps come from the sender, so a back-filled or clock-skewed
+        reading can arrive out of order. The ring is rewritten oldest first
+        from slot 0, keeping it sorted for scores_since. When full, the
+        oldest reading is evicted, or the new one is dropped if it is older
+        than everything retained.
+        """
+        size = len(self)
+        order = (np.arange(size) + (self.head - size)) % self.capacity
+        arrays = (self.scores, self.stress, self.energy, self.emotions, self.timestamps)
+        columns = [array[order] for array in arrays]
+        position = int(np.searchsorted(columns[-1], timestamp, side="right"))
+        
+        if size == self.capacity:
+            if position == 0:
+                return
+            self._tally(int(columns[0][0]), -1)
+            columns = [column[1:] for column in columns]
+            position -= 1
+        
+        values = (
+            mood_score,
+            -1 if stress_level is None else stress_level,
+            -1 if energy_level is None else energy_level,
+            emotion_bits,
+            timestamp,
+        )
+        for array, column, value in zip(arrays, columns, values):
+            array[:column.size + 1] = np.insert(column, position, value)
+        self._tally(mood_score, 1)
+        self.head = columns[0].size + 1
+    
+    def scores_since(self, cutoff: float) -> np.ndarray:
+        """
+        Return mood scores recorded at or after the cutoff epoch, oldest first.
+        
+        Readings are kept in timestamp order (see _insert_ordered), so each
+        side of the ring is sorted. The result is a view unless the window wraps
+        around the end of the ring.
+        """
+        if self.head <= self.capacity:
+            start = int(np.searchsorted(self.timestamps[:self.head], cutoff, side="left"))
+            return self.scores[start:self.head]
+        
+        split = self.head % self.capacity  # slot of the oldest reading
+        if split and self.timestamps[self.capacity - 1] >= cutoff:
+            start = split + int(np.searchsorted(self.timestamps[split:], cutoff, side="left"))
+            return np.concatenate((self.scores[start:], self.scores[:split]))
+        
+        end = split or self.capacity
+        start = int(np.searchsorted(self.timestamps[:end], cutoff, side="left"))
+        return self.scores[start:end]
+    
+    def scores_view(self, days: int) -> np.ndarray:
+        """Return mood scores from the last `days` days, oldest first."""
+        return self.scores_since(time.time() - days * 86400)
+
+@dataclass
+class MoodShard:
+    """Score buffers for the users hashed to one shard, guarded by the shard's lock."""
+    buffers: Dict[str, MoodBuffer] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+# In-memory storage for mood data; score buffers are backed by per-user logs
+# in MOOD_LOG_DIR when mood logs are enabled
+mood_history: Dict[str, deque] = {}  # readings with notes or emotions
+mood_timestamps: Dict[str, deque] = {}  # epoch seconds parallel to mood_history
+
+# Score buffers are sharded by user so batches for different shards can be
+# processed in parallel worker threads
+MOOD_SHARD_COUNT = os.cpu_count() or 1
+_shards = [MoodShard() for _ in range(MOOD_SHARD_COUNT)]
+
+def _shard_index(user_id: str) -> int:
+    """Return the shard a user's data lives in (stable across restarts)."""
+    return zlib.crc32(user_id.encode("utf-8")) % MOOD_SHARD_COUNT
+
+def _shard_for(user_id: str) -> MoodShard:
+    return _shards[_shard_index(user_id)]
+
+# Alert thresholds, as module constants for the hot analysis path
+LOW_MOOD_THR: int = 3
+HIGH_MOOD_THR: int = 8
+CONSECUTIVE_LOW_DAYS: int = 3
+STRESS_THR: int = 7
+ENERGY_THR: int = 2
+CRISIS_KEYWORDS = (
+    "suicide", "kill myself", "end it all", "hopeless", "worthless",
+    "can't go on", "no point", "give up", "hurt myself"
+)
+
+# Read-only view of the thresholds for external configuration readers
+ALERT_THRESHOLDS = MappingProxyType({
+    "low_mood_threshold": LOW_MOOD_THR,
+    "consecutive_low_days": CONSECUTIVE_LOW_DAYS,
+    "stress_threshold": STRESS_THR,
+    "energy_threshold": ENERGY_THR,
+    "crisis_keywords": CRISIS_KEYWORDS,
+})
+
+# Recommendation groups shared across analyses
+_LOW_MOOD_RECS = ("breathing_exercises", "mood_boosting_activities", "social_connection")
+_HIGH_STRESS_RECS = ("stress_reduction_techniques", "mindfulness_practice", "relaxation_exercises")
+_LOW_ENERGY_RECS = ("energy_boosting_activities", "sleep_hygiene_check", "nutrition_review")
+_INTERVENTION_RECS = (
+    "professional_consultation",
+    "mood_tracking_continuation",
+    "coping_strategies_review",
+)
+
+def _build_crisis_automaton():
+    """Build a single Aho-Corasick automaton over all crisis keywords."""
+    if not HAS_AHOCORASICK:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in CRISIS_KEYWORDS:
+        automaton.add_word(keyword.lower(), keyword.lower())
+    automaton.make_automaton()
+    return automaton
+
+# Built once at import so each scan is one linear pass regardless of keyword count
+_CRISIS_AUTOMATON = _build_crisis_automaton()
+
+# Stdlib fallback: longer phrases first so "kill myself" wins over shorter overlaps
+_CRISIS_RE = re.compile(
+    "|".join(map(re.escape, sorted(CRISIS_KEYWORDS, key=len, reverse=True))),
+    re.IGNORECASE,
+)
+
+# Separator used when scanning notes and emotions together; no keyword contains it
+_SCAN_SEPARATOR = " \x00 "
+
+# Maximum number of distinct crisis keywords reported per scan unless full=True
+MAX_CRISIS_INDICATORS = 5
+
+# Shortest text that could possibly contain a crisis keyword
+_MIN_CRISIS_KEYWORD_LEN = min(len(keyword) for keyword in CRISIS_KEYWORDS)
+
+def _iter_crisis_keywords(text: str):
+    """Yield crisis keywords in the order they occur in the text."""
+    # Short texts such as single emotions cannot hold any keyword
+    if len(text) < _MIN_CRISIS_KEYWORD_LEN:
+        return
+    
+    if _CRISIS_AUTOMATON is not None:
+        text_lower = text if text.isascii() and text.islower() else text.lower()
+        for _, keyword in _CRISIS_AUTOMATON.iter(text_lower):
+            yield keyword
+    else:
+        for match in _CRISIS_RE.finditer(text):
+            yield match.group().lower()
 
-def detect_crisis_indicators(text: str) -> List[str]:
+def detect_crisis_indicators(text: str, full: bool = False) -> List[str]:
     """
     Detect crisis indicators in mood notes or emotions.
     
     Args:
         text: Text to analyze for crisis indicators
+        full: Report every distinct keyword instead of stopping at MAX_CRISIS_INDICATORS
         
     Returns:
-        List of detected crisis indicators
+        List of detected crisis indicators, without duplicates
     """
+    return [f"crisis_keyword: {keyword}" for keyword in _detect_crisis_keywords(text, full)]
+
+def _detect_crisis_keywords(text: str, full: bool = False) -> List[str]:
+    """Return distinct crisis keywords in the text, capped unless full=True."""
     if not text:
         return []
     
-    text_lower = text.lower()
-    detected = []
+    detected = {}
+    for keyword in _iter_crisis_keywords(text):
+        detected[keyword] = None
+        if not full and len(detected) >= MAX_CRISIS_INDICATORS:
+            break
+    
+    return list(detected)
+
+def detect_crisis_indicators_any(text: str) -> Optional[str]:
+    """
+    Return the first crisis indicator in the text without scanning the rest.
+    
+    Args:
+        text: Text to analyze for crisis indicators
+        
+    Returns:
+        The first detected crisis indicator, or None
+    """
+    if not text:
+        return None
+    
+    for keyword in _iter_crisis_keywords(text):
+        return f"crisis_keyword: {keyword}"
+    return None
+
+# Tracked emotions mapped to bit positions; anything else sets _UNKNOWN_EMOTION_BIT
+_TRACKED_EMOTIONS = (
+    "happy", "sad", "anxious", "angry", "calm", "content", "excited", "grateful",
+    "hopeful", "lonely", "stressed", "tired", "frustrated", "overwhelmed", "scared",
+    "worried", "depressed", "irritable", "numb", "guilty", "ashamed", "hopeless",
+    "worthless", "empty", "peaceful", "confident", "nervous", "disappointed",
+    "relaxed", "energetic",
+)
+_EMOTION_ID = {emotion: bit for bit, emotion in enumerate(_TRACKED_EMOTIONS)}
+_UNKNOWN_EMOTION_BIT = 63
+
+# Tracked emotions that are themselves crisis keywords, resolved once at import
+_CRISIS_EMOTION_KEYWORDS = {
+    _EMOTION_ID[emotion]: _detect_crisis_keywords(emotion)
+    for emotion in _TRACKED_EMOTIONS
+    if _detect_crisis_keywords(emotion)
+}
+_CRISIS_EMOTION_MASK = sum(1 << bit for bit in _CRISIS_EMOTION_KEYWORDS)
+
+class AlertCode(IntEnum):
+    """Alerts raised by mood analysis; formatted to strings only for the wire."""
+    CRISIS = 1
+    LOW_MOOD = 2
+    HIGH_STRESS = 3
+    LOW_ENERGY = 4
+    DECLINING = 5
+    CONSECUTIVE_LOW = 6
+
+_ALERT_FORMATS = {
+    AlertCode.CRISIS: "crisis_keyword: {}",
+    AlertCode.LOW_MOOD: "low_mood_score: {}",
+    AlertCode.HIGH_STRESS: "high_stress_level: {}",
+    AlertCode.LOW_ENERGY: "low_energy_level: {}",
+    AlertCode.DECLINING: "declining_mood_trend",
+    AlertCode.CONSECUTIVE_LOW: "consecutive_low_mood_days",
+}
+
+def format_alerts(alerts: List[Tuple[AlertCode, Any]]) -> List[str]:
+    """Format (code, value) alerts into their wire strings."""
+    return [_ALERT_FORMATS[code].format(value) for code, value in alerts]
+
+def encode_emotions(emotions: Optional[List[str]]) -> Tuple[int, List[str]]:
+    """
+    Encode emotions as a bitmap of tracked emotion IDs.
+    
+    Args:
+        emotions: Emotions reported with a mood reading
+        
+    Returns:
+        Tuple of the emotion bitmap and the emotions that are not tracked
+    """
+    bits = 0
+    unknown = []
+    for emotion in emotions or []:
+        bit = _EMOTION_ID.get(emotion.lower())
+        if bit is None:
+            bit = _UNKNOWN_EMOTION_BIT
+            unknown.append(emotion)
+        bits |= 1 << bit
+    return bits, unknown
+
+@lru_cache(maxsize=1024)
+def _threshold_findings(mood_score: int, stress_level: Optional[int],
+                        energy_level: Optional[int]) -> Tuple[tuple, FrozenSet[str]]:
+    """
+    Evaluate the per-reading threshold checks for one combination of levels.
     
-    for keyword in ALERT_THRESHOLDS["crisis_keywords"]:
-        if keyword in text_lower:
-            detected.append(f"crisis_keyword: {keyword}")
+    Scores and levels only take a handful of values, so results are memoized
+    and each reading costs a single cache lookup.
     
-    return detected
+    Returns:
+        Tuple of (AlertCode, value) alerts and the recommendations they imply
+    """
+    alerts = []
+    recommendations = set()
+    
+    if mood_score <= LOW_MOOD_THR:
+        alerts.append((AlertCode.LOW_MOOD, mood_score))
+        recommendations.update(_LOW_MOOD_RECS)
+    
+    if stress_level and stress_level >= STRESS_THR:
+        alerts.append((AlertCode.HIGH_STRESS, stress_level))
+        recommendations.update(_HIGH_STRESS_RECS)
+    
+    if energy_level and energy_level <= ENERGY_THR:
+        alerts.append((AlertCode.LOW_ENERGY, energy_level))
+        recommendations.update(_LOW_ENERGY_RECS)
+    
+    return tuple(alerts), frozenset(recommendations)
 
-def analyze_mood_reading(mood_reading: Dict, user_history: List[Dict]) -> Dict[str, Any]:
+def analyze_mood_reading(mood_reading: MoodReading, recent_scores: np.ndarray,
+                         encoded_emotions: Optional[Tuple[int, List[str]]] = None) -> Dict[str, Any]:
     """
     Analyze a mood reading for patterns, trends, and alerts.
     
     Args:
         mood_reading: Current mood reading
-        user_history: Historical mood readings for the user
+        recent_scores: Up to the last 7 mood scores from the past week, oldest first
+        encoded_emotions: Result of encode_emotions for the reading, if already computed
         
     Returns:
-        Analysis results including trends, alerts, and recommendations
+        Analysis results including trends, (AlertCode, value) alerts, and a set
+        of recommendations
     """
     analysis = {
         "mood_trend": "stable",
         "needs_intervention": False,
+        "crisis_detected": False,
         "alerts": [],
-        "recommendations": [],
+        "recommendations": set(),
         "patterns": []
     }
     
-    mood_score = mood_reading.get("mood_score", 5)
-    stress_level = mood_reading.get("stress_level", 5)
-    energy_level = mood_reading.get("energy_level", 5)
-    emotions = mood_reading.get("emotions", [])
-    notes = mood_reading.get("notes", "")
+    mood_score = mood_reading.mood_score
+    stress_level = mood_reading.stress_level
+    energy_level = mood_reading.energy_level
+    notes = mood_reading.notes
+    emotion_bits, unknown_emotions = encoded_emotions or encode_emotions(mood_reading.emotions)
     
-    # Check for immediate crisis indicators
-    crisis_indicators = detect_crisis_indicators(notes)
-    for emotion in emotions:
-        crisis_indicators.extend(detect_crisis_indicators(emotion))
+    # Check for immediate crisis indicators: tracked emotions via the bitmap,
+    # notes and untracked emotions with a single text scan
+    crisis_keywords = _detect_crisis_keywords(
+        _SCAN_SEPARATOR.join([notes or "", *unknown_emotions])
+    )
+    if emotion_bits & _CRISIS_EMOTION_MASK:
+        for bit, keywords in _CRISIS_EMOTION_KEYWORDS.items():
+            if emotion_bits >> bit & 1:
+                crisis_keywords.extend(
+                    keyword for keyword in keywords if keyword not in crisis_keywords
+                )
     
-    if crisis_indicators:
-        analysis["alerts"].extend(crisis_indicators)
+    if crisis_keywords:
+        analysis["alerts"].extend(
+            (AlertCode.CRISIS, keyword) for keyword in crisis_keywords[:MAX_CRISIS_INDICATORS]
+        )
+        analysis["crisis_detected"] = True
         analysis["needs_intervention"] = True
-        analysis["recommendations"].append("immediate_professional_support")
-    
-    # Low mood detection
-    if mood_score <= ALERT_THRESHOLDS["low_mood_threshold"]:
-        analysis["alerts"].append(f"low_mood_score: {mood_score}")
-        analysis["recommendations"].extend([
-            "breathing_exercises",
-            "mood_boosting_activities",
-            "social_connection"
-        ])
-    
-    # High stress detection
-    if stress_level and stress_level >= ALERT_THRESHOLDS["stress_threshold"]:
-        analysis["alerts"].append(f"high_stress_level: {stress_level}")
-        analysis["recommendations"].extend([
-            "stress_reduction_techniques",
-            "mindfulness_practice",
-            "relaxation_exercises"
-        ])
-    
-    # Low energy detection
-    if energy_level and energy_level <= ALERT_THRESHOLDS["energy_threshold"]:
-        analysis["alerts"].append(f"low_energy_level: {energy_level}")
-        analysis["recommendations"].extend([
-            "energy_boosting_activities",
-            "sleep_hygiene_check",
-            "nutrition_review"
-        ])
+        analysis["recommendations"].add("immediate_professional_support")
+    
+    # Low mood, high stress and low energy detection
+    threshold_alerts, threshold_recs = _threshold_findings(mood_score, stress_level, energy_level)
+    analysis["alerts"].extend(threshold_alerts)
+    analysis["recommendations"].update(threshold_recs)
     
     # Analyze historical trends if available
-    if len(user_history) >= 3:
-        recent_scores = [entry.get("mood_score", 5) for entry in user_history[-7:]]
-        avg_recent = sum(recent_scores) / len(recent_scores)
+    recent_scores = np.asarray(recent_scores, dtype=np.int64)
+    if recent_scores.size >= 3:
+        score_sum, count, _, _, low_days = _mood_stats(
+            recent_scores, LOW_MOOD_THR, HIGH_MOOD_THR
+        )
+        avg_recent = score_sum / count
         
         if avg_recent < 4:
             analysis["mood_trend"] = "declining"
             analysis["needs_intervention"] = True
-            analysis["alerts"].append("declining_mood_trend")
+            analysis["alerts"].append((AlertCode.DECLINING, None))
         elif avg_recent > 7:
             analysis["mood_trend"] = "improving"
         
         # Check for consecutive low days
-        low_days = sum(1 for score in recent_scores[-3:] if score <= ALERT_THRESHOLDS["low_mood_threshold"])
-        if low_days >= ALERT_THRESHOLDS["consecutive_low_days"]:
-            analysis["alerts"].append("consecutive_low_mood_days")
+        if low_days >= CONSECUTIVE_LOW_DAYS:
+            analysis["alerts"].append((AlertCode.CONSECUTIVE_LOW, None))
             analysis["needs_intervention"] = True
     
-    # Remove duplicate recommendations
-    analysis["recommendations"] = list(set(analysis["recommendations"]))
-    
     return analysis
 
-def store_mood_reading(user_id: str, mood_data: Dict) -> None:
-    """Store mood reading in memory."""
-    if user_id not in mood_history:
-        mood_history[user_id] = []
+def _mood_stats_loop(scores, low_threshold, high_threshold):
+    """Single pass over scores returning (sum, count, low, high, low in last 3)."""
+    total = 0
+    low_count = 0
+    high_count = 0
+    low_last3 = 0
+    count = scores.shape[0]
+    for i in range(count):
+        score = scores[i]
+        total += score
+        if score <= low_threshold:
+            low_count += 1
+            if i >= count - 3:
+                low_last3 += 1
+        if score >= high_threshold:
+            high_count += 1
+    return total, count, low_count, high_count, low_last3
+
+def _mood_stats_numpy(scores, low_threshold, high_threshold):
+    """Vectorized equivalent of _mood_stats_loop for environments without Numba."""
+    low = scores <= low_threshold
+    return (
+        int(scores.sum()),
+        int(scores.size),
+        int(low.sum()),
+        int((scores >= high_threshold).sum()),
+        int(low[-3:].sum()),
+    )
+
+_mood_stats = njit(cache=True, nogil=True)(_mood_stats_loop) if HAS_NUMBA else _mood_stats_numpy
+
+def _to_epoch(timestamp: str) -> int:
+    """Convert an ISO timestamp (naive values are UTC) to epoch seconds."""
+    # Only sender-supplied timestamps need parsing, so datetime is imported lazily
+    from datetime import datetime, timezone
     
-    # Add timestamp if not present
-    if "timestamp" not in mood_data:
-        mood_data["timestamp"] = datetime.utcnow().isoformat()
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+# Accepted ranges for a reading's numeric fields
+_SCORE_RANGE = range(1, 11)
+MAX_SLEEP_HOURS = 24
+
+def validate_mood_reading(mood_reading: MoodReading) -> None:
+    """Raise ValueError if a reading's scores or sleep hours are out of range."""
+    if mood_reading.mood_score not in _SCORE_RANGE:
+        raise ValueError(f"mood_score must be between 1 and 10, got {mood_reading.mood_score}")
+    for name in ("stress_level", "energy_level"):
+        value = getattr(mood_reading, name)
+        if value is not None and value not in _SCORE_RANGE:
+            raise ValueError(f"{name} must be between 1 and 10, got {value}")
+    if mood_reading.sleep_hours is not None and not 0 <= mood_reading.sleep_hours <= MAX_SLEEP_HOURS:
+        raise ValueError(f"sleep_hours must be between 0 and {MAX_SLEEP_HOURS}, got {mood_reading.sleep_hours}")
+
+# Fixed-size reading record: mood, stress, energy, sleep (tenths of an hour),
+# emotion bitmap, epoch seconds. Missing optional values are stored as -1.
+_MOOD_RECORD = struct.Struct("<BbbhQq")
+
+# Each record is sealed on its own (nonce + ciphertext + tag), so log entries
+# stay fixed-size and the tail can still be read without scanning the file
+_MOOD_LOG_NONCE_SIZE = 12
+_MOOD_LOG_ENTRY_SIZE = _MOOD_LOG_NONCE_SIZE + _MOOD_RECORD.size + 16
+
+def _build_mood_log_cipher():
+    """Return the AES-GCM cipher for mood logs, or None if logs are disabled."""
+    if not MOOD_LOG_DIR:
+        return None
+    if not HAS_CRYPTOGRAPHY:
+        logger.warning("MOOD_LOG_DIR is set but cryptography is not installed; mood logs are disabled")
+        return None
+    if not MOOD_LOG_KEY:
+        logger.warning("MOOD_LOG_DIR is set without MOOD_LOG_KEY; mood logs are disabled")
+        return None
     
-    mood_history[user_id].append(mood_data)
+    try:
+        return AESGCM(base64.b64decode(MOOD_LOG_KEY, validate=True))
+    except ValueError as e:
+        logger.warning("Invalid MOOD_LOG_KEY, mood logs are disabled: %s", e)
+        return None
+
+_MOOD_LOG_CIPHER = _build_mood_log_cipher()
+
+def _mood_log_path(user_id: str) -> Tuple[str, bytes]:
+    """Return the append-only log file path for a user and its file id."""
+    digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(MOOD_LOG_DIR, f"{digest}.bin"), digest.encode("ascii")
+
+def _append_mood_record(user_id: str, mood_reading: MoodReading,
+                        emotion_bits: int, epoch: int) -> None:
+    """Append an encrypted reading to the user's log so the score buffer survives restarts."""
+    if _MOOD_LOG_CIPHER is None:
+        return
     
-    # Keep only last 100 readings in memory
-    if len(mood_history[user_id]) > 100:
-        mood_history[user_id] = mood_history[user_id][-100:]
+    sleep_deci = -1 if mood_reading.sleep_hours is None else int(round(mood_reading.sleep_hours * 10))
+    record = _MOOD_RECORD.pack(
+        mood_reading.mood_score,
+        -1 if mood_reading.stress_level is None else mood_reading.stress_level,
+        -1 if mood_reading.energy_level is None else mood_reading.energy_level,
+        sleep_deci,
+        emotion_bits,
+        epoch,
+    )
+    path, file_id = _mood_log_path(user_id)
+    # The file id is authenticated, so records cannot be moved between users' logs
+    nonce = os.urandom(_MOOD_LOG_NONCE_SIZE)
+    entry = nonce + _MOOD_LOG_CIPHER.encrypt(nonce, record, file_id)
+    try:
+        os.makedirs(MOOD_LOG_DIR, mode=0o700, exist_ok=True)
+        with open(os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600), "ab") as log_file:
+            # Drop a partial entry left behind by an interrupted write
+            size = os.fstat(log_file.fileno()).st_size
+            if size % _MOOD_LOG_ENTRY_SIZE:
+                os.ftruncate(log_file.fileno(), size - size % _MOOD_LOG_ENTRY_SIZE)
+            log_file.write(entry)
+            log_file.flush()
+    except OSError as e:
+        logger.warning("Could not persist mood reading for user %s: %s", user_id, e)
+
+def _load_mood_buffer(user_id: str) -> Optional[MoodBuffer]:
+    """Rebuild a user's score buffer from the tail of their log, if one exists."""
+    if _MOOD_LOG_CIPHER is None:
+        return None
     
-    logger.info(f"Stored mood reading for user {user_id}: score {mood_data.get('mood_score')}")
+    path, file_id = _mood_log_path(user_id)
+    try:
+        size = os.path.getsize(path)
+        # Ignore a partial entry left behind by an interrupted write; the next append drops it
+        aligned = size - size % _MOOD_LOG_ENTRY_SIZE
+        if aligned == 0:
+            return None
+        
+        buffer = MoodBuffer()
+        start = max(0, aligned - buffer.capacity * _MOOD_LOG_ENTRY_SIZE)
+        with open(path, "rb") as log_file, \
+                mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(start, aligned, _MOOD_LOG_ENTRY_SIZE):
+                nonce = mapped[offset:offset + _MOOD_LOG_NONCE_SIZE]
+                sealed = mapped[offset + _MOOD_LOG_NONCE_SIZE:offset + _MOOD_LOG_ENTRY_SIZE]
+                mood, stress, energy, _, emotion_bits, epoch = _MOOD_RECORD.unpack(
+                    _MOOD_LOG_CIPHER.decrypt(nonce, sealed, file_id)
+                )
+                buffer.append(
+                    mood,
+                    None if stress < 0 else stress,
+                    None if energy < 0 else energy,
+                    epoch,
+                    emotion_bits,
+                )
+        return buffer
+    except FileNotFoundError:
+        return None
+    except InvalidTag:
+        logger.warning("Mood log for user %s could not be decrypted with MOOD_LOG_KEY", user_id)
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Could not load mood log for user %s: %s", user_id, e)
+        return None
+
+def get_mood_buffer(user_id: str) -> Optional[MoodBuffer]:
+    """Get a user's score buffer, loading it from their log on first access."""
+    buffers = _shard_for(user_id).buffers
+    buffer = buffers.get(user_id)
+    if buffer is None:
+        buffer = _load_mood_buffer(user_id)
+        if buffer is not None:
+            buffers[user_id] = buffer
+    return buffer
 
-def get_user_mood_history(user_id: str, days: int = 7) -> List[Dict]:
-    """Get user's mood history for specified number of days."""
+def _record_history(user_id: str, mood_reading: MoodReading, epoch: int) -> None:
+    """Add an annotated reading to mood_history, keeping both deques in timestamp order."""
+    history, timestamps = mood_history[user_id], mood_timestamps[user_id]
+    if not timestamps or epoch >= timestamps[-1]:
+        # Both deques keep only the last 100 readings in memory
+        history.append(mood_reading)
+        timestamps.append(epoch)
+        return
+    
+    # A back-dated reading goes to its sorted position, evicting the oldest when full
+    position = bisect.bisect_right(timestamps, epoch)
+    if len(timestamps) == timestamps.maxlen:
+        if position == 0:
+            return
+        history.popleft()
+        timestamps.popleft()
+        position -= 1
+    history.insert(position, mood_reading)
+    timestamps.insert(position, epoch)
+
+def store_mood_reading(mood_reading: MoodReading, emotion_bits: Optional[int] = None,
+                       received_at: Optional[int] = None) -> None:
+    """
+    Store mood reading in the user's score buffer.
+    
+    The reading itself is only kept in mood_history when it carries notes
+    or emotions, since the buffer already holds every numeric field.
+    Readings without a sender timestamp are filed under received_at
+    (epoch seconds), or the current time when that is not given either.
+    """
+    validate_mood_reading(mood_reading)
+    if emotion_bits is None:
+        emotion_bits, _ = encode_emotions(mood_reading.emotions)
+    
+    user_id = mood_reading.user_id
     if user_id not in mood_history:
-        return []
+        mood_history[user_id] = deque(maxlen=MAX_READINGS_PER_USER)
+        mood_timestamps[user_id] = deque(maxlen=MAX_READINGS_PER_USER)
+    buffer = get_mood_buffer(user_id)
+    if buffer is None:
+        buffer = _shard_for(user_id).buffers[user_id] = MoodBuffer()
+    
+    if mood_reading.timestamp:
+        epoch = _to_epoch(mood_reading.timestamp)
+    else:
+        epoch = received_at or int(time.time())
+    _append_mood_record(user_id, mood_reading, emotion_bits, epoch)
+    buffer.append(
+        mood_reading.mood_score,
+        mood_reading.stress_level,
+        mood_reading.energy_level,
+        epoch,
+        emotion_bits,
+    )
+    
+    if mood_reading.notes or mood_reading.emotions:
+        _record_history(user_id, mood_reading, epoch)
     
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    logger.info("Stored mood reading for user %s: score %s", user_id, mood_reading.mood_score)
+
+def get_recent_mood_scores(user_id: str, days: int = 7) -> np.ndarray:
+    """Get up to the last 7 mood scores recorded within the given number of days."""
+    buffer = get_mood_buffer(user_id)
+    if buffer is None:
+        return np.empty(0, dtype=np.int8)
+    
+    cutoff = time.time() - days * 86400
+    return buffer.scores_since(cutoff)[-RECENT_READINGS_WINDOW:]
+
+def _window_stats(buffer: MoodBuffer, scores: np.ndarray) -> Tuple[float, float, float, int, int]:
+    """
+    Compute statistics for a non-empty window of a user's mood scores.
     
-    filtered_history = []
-    for entry in mood_history[user_id]:
-        entry_date = datetime.fromisoformat(entry.get("timestamp", datetime.utcnow().isoformat()))
-        if entry_date >= cutoff_date:
-            filtered_history.append(entry)
+    Returns:
+        Tuple of (average, recent average, earlier average, low count, high count);
+        the recent/earlier averages cover the last and first three scores
+    """
+    # Reuse the buffer's running tallies when the window covers every retained reading
+    if scores.size == len(buffer):
+        score_sum, low_count, high_count = buffer.score_sum, buffer.low_count, buffer.high_count
+    else:
+        score_sum, _, low_count, high_count, _ = _mood_stats(
+            scores.astype(np.int64), LOW_MOOD_THR, HIGH_MOOD_THR
+        )
     
-    return filtered_history
+    return (
+        score_sum / scores.size,
+        float(scores[-3:].mean()),
+        float(scores[:3].mean()),
+        int(low_count),
+        int(high_count),
+    )
+
+def get_user_mood_history(user_id: str, days: int = 7) -> List[MoodReading]:
+    """Get user's annotated mood readings for specified number of days."""
+    if user_id not in mood_history:
+        return []
+    
+    # Readings are kept in timestamp order, so the cutoff can be bisected
+    cutoff = time.time() - days * 86400
+    start = bisect.bisect_left(mood_timestamps[user_id], cutoff)
+    return list(itertools.islice(mood_history[user_id], start, None))
 
 # Create mood tracking protocol
 mood_protocol = Protocol("Mood Tracking Protocol")
 
-@mood_protocol.on_message(model=MoodReading)
-async def handle_mood_entry(ctx: Context, sender: str, msg: MoodReading):
+# Pending mood entries, drained in batches by run_mood_entry_worker
+MOOD_BATCH_SIZE = 64
+_pending_entries: asyncio.Queue = asyncio.Queue()
+_entry_worker: Optional[asyncio.Task] = None
+
+def _store_without_analysis(ctx: Context, msg: MoodReading, encoded_emotions: Tuple[int, List[str]],
+                            received_at: int) -> MoodEntryResponse:
+    """Store a log-only mood entry, still checking it for crisis keywords."""
+    emotion_bits, unknown_emotions = encoded_emotions
+    store_mood_reading(msg, emotion_bits, received_at)
+    
+    crisis_alert = None
+    if emotion_bits & _CRISIS_EMOTION_MASK:
+        for bit, keywords in _CRISIS_EMOTION_KEYWORDS.items():
+            if emotion_bits >> bit & 1:
+                crisis_alert = format_alerts([(AlertCode.CRISIS, keywords[0])])[0]
+                break
+    else:
+        crisis_alert = detect_crisis_indicators_any(
+            _SCAN_SEPARATOR.join([msg.notes or "", *unknown_emotions])
+        )
+    
+    if crisis_alert is None:
+        return MoodEntryResponse(
+            status="stored",
+            mood_score=msg.mood_score,
+            analysis={},
+            recommendations=[],
+            alerts=[]
+        )
+    
+    ctx.logger.critical("CRISIS DETECTED for user %s. Immediate intervention needed.", msg.user_id)
+    return MoodEntryResponse(
+        status="stored",
+        mood_score=msg.mood_score,
+        analysis={"crisis_detected": True, "needs_intervention": True},
+        recommendations=["immediate_professional_support"],
+        alerts=[crisis_alert]
+    )
+
+def process_mood_entry(ctx: Context, sender: str, msg: MoodReading,
+                       received_at: int) -> MoodEntryResponse:
     """
-    Handle new mood entry from user or other agents.
+    Store and analyze a single mood entry.
     
     Args:
         ctx: Agent context
         sender: Sender address
         msg: Mood reading data
+        received_at: Arrival time in epoch seconds
+        
+    Returns:
+        Response to send back to the sender
     """
     try:
-        ctx.logger.info(f"Received mood entry from {sender} for user {msg.user_id}")
+        encoded_emotions = encode_emotions(msg.emotions)
         
-        # Convert mood reading to dict for processing
-        mood_data = asdict(msg)
+        if isinstance(msg, MoodLogEntry):
+            return _store_without_analysis(ctx, msg, encoded_emotions, received_at)
         
-        # Get user's mood history
-        user_history = get_user_mood_history(msg.user_id)
+        # Get user's recent mood scores from the score buffer
+        recent_scores = get_recent_mood_scores(msg.user_id)
         
         # Analyze the mood reading
-        analysis = analyze_mood_reading(mood_data, user_history)
+        analysis = analyze_mood_reading(msg, recent_scores, encoded_emotions)
         
         # Store the mood reading
-        store_mood_reading(msg.user_id, mood_data)
+        store_mood_reading(msg, encoded_emotions[0], received_at)
         
-        # Prepare response
+        # Prepare response; alerts and recommendations are materialized for the wire
+        analysis["alerts"] = format_alerts(analysis["alerts"])
+        analysis["recommendations"] = list(analysis["recommendations"])
         response = MoodEntryResponse(
             status="success",
             mood_score=msg.mood_score,
             analysis=analysis,
-            recommendations=analysis.get("recommendations", []),
-            alerts=analysis.get("alerts", [])
+            recommendations=analysis["recommendations"],
+            alerts=analysis["alerts"]
         )
         
-        # Send response back to sender
-        await ctx.send(sender, response)
-        
         # Log intervention needs
         if analysis.get("needs_intervention"):
-            ctx.logger.warning(f"User {msg.user_id} may need intervention. Alerts: {analysis.get('alerts')}")
+            ctx.logger.warning("User %s may need intervention. Alerts: %s", msg.user_id, analysis.get("alerts"))
         
         # If crisis detected, could send alert to coordinator agent
-        if any("crisis" in alert for alert in analysis.get("alerts", [])):
-            ctx.logger.critical(f"CRISIS DETECTED for user {msg.user_id}. Immediate intervention needed.")
+        if analysis["crisis_detected"]:
+            ctx.logger.critical("CRISIS DETECTED for user %s. Immediate intervention needed.", msg.user_id)
             # TODO: Send crisis alert to conversation coordinator or emergency services
         
+        return response
+        
     except Exception as e:
-        ctx.logger.error(f"Error processing mood entry: {str(e)}")
+        ctx.logger.error("Error processing mood entry from %s: %s", sender, e)
         
-        error_response = MoodEntryResponse(
+        return MoodEntryResponse(
             status="error",
             mood_score=msg.mood_score,
             analysis={"error": str(e)},
             recommendations=[],
             alerts=["processing_error"]
         )
-        await ctx.send(sender, error_response)
+
+@mood_protocol.on_message(model=MoodReading)
+async def handle_mood_entry(ctx: Context, sender: str, msg: MoodReading):
+    """
+    Queue a new mood entry from user or other agents for batched processing.
+    
+    Args:
+        ctx: Agent context
+        sender: Sender address
+        msg: Mood reading data
+    """
+    ctx.logger.info("Received mood entry from %s for user %s", sender, msg.user_id)
+    # Arrival time is stamped here rather than on the wire model
+    _pending_entries.put_nowait((sender, msg, int(time.time())))
+
+@mood_protocol.on_message(model=MoodLogEntry)
+async def handle_mood_log_entry(ctx: Context, sender: str, msg: MoodLogEntry):
+    """
+    Queue a store-only mood entry; it is checked for crisis keywords but not analyzed.
+    
+    Args:
+        ctx: Agent context
+        sender: Sender address
+        msg: Mood reading data
+    """
+    ctx.logger.info("Received mood log entry from %s for user %s", sender, msg.user_id)
+    _pending_entries.put_nowait((sender, msg, int(time.time())))
+
+async def run_mood_entry_worker(ctx: Context):
+    """
+    Wait for queued mood entries and process whatever has accumulated, up to MOOD_BATCH_SIZE.
+    
+    Runs for the agent's lifetime, started by the startup handler.
+    """
+    while True:
+        batch = [await _pending_entries.get()]
+        while len(batch) < MOOD_BATCH_SIZE and not _pending_entries.empty():
+            batch.append(_pending_entries.get_nowait())
+        
+        try:
+            await process_mood_entry_batch(ctx, batch)
+        except Exception as e:
+            ctx.logger.error("Error processing %d mood entries: %s", len(batch), e)
+
+async def process_mood_entry_batch(ctx: Context, batch: List[Tuple[str, MoodReading, int]]):
+    """
+    Process a batch of queued mood entries and reply to all senders at once.
+    
+    Entries are grouped by shard. Each group is processed under its shard's
+    lock in a worker thread, so shards run in parallel while entries for the
+    same user keep their arrival order.
+    """
+    by_shard: Dict[int, List[Tuple[str, MoodReading, int]]] = {}
+    for entry in batch:
+        by_shard.setdefault(_shard_index(entry[1].user_id), []).append(entry)
+    
+    loop = asyncio.get_running_loop()
+    
+    async def run_shard(index: int, entries: List[Tuple[str, MoodReading, int]]):
+        async with _shards[index].lock:
+            return await loop.run_in_executor(
+                None,
+                lambda: [
+                    (sender, process_mood_entry(ctx, sender, msg, received_at))
+                    for sender, msg, received_at in entries
+                ]
+            )
+    
+    grouped = await asyncio.gather(*(run_shard(index, entries) for index, entries in by_shard.items()))
+    replies = [reply for group in grouped for reply in group]
+    results = await asyncio.gather(
+        *(ctx.send(sender, response) for sender, response in replies),
+        return_exceptions=True
+    )
+    
+    for (sender, _), result in zip(replies, results):
+        if isinstance(result, Exception):
+            ctx.logger.error("Error sending mood entry response to %s: %s", sender, result)
 
 @mood_protocol.on_message(model=MoodAnalysisRequest)
 async def handle_mood_analysis_request(ctx: Context, sender: str, msg: MoodAnalysisRequest):
@@ -311,12 +1020,15 @@ async def handle_mood_analysis_request(ctx: Context, sender: str, msg: MoodAnaly
         msg: Analysis request
     """
     try:
-        ctx.logger.info(f"Received mood analysis request from {sender} for user {msg.user_id}")
+        ctx.logger.info("Received mood analysis request from %s for user %s", sender, msg.user_id)
         
-        # Get user's mood history
-        user_history = get_user_mood_history(msg.user_id, msg.days)
+        # Get user's mood scores for the requested window
+        async with _shard_for(msg.user_id).lock:
+            buffer = get_mood_buffer(msg.user_id)
+            mood_scores = buffer.scores_view(msg.days or 7) if buffer else np.empty(0, dtype=np.int8)
+            stats = _window_stats(buffer, mood_scores) if mood_scores.size else None
         
-        if not user_history:
+        if stats is None:
             response = MoodAnalysisResponse(
                 user_id=msg.user_id,
                 mood_trend="insufficient_data",
@@ -327,15 +1039,10 @@ async def handle_mood_analysis_request(ctx: Context, sender: str, msg: MoodAnaly
                 patterns=[]
             )
         else:
-            # Calculate statistics
-            mood_scores = [entry.get("mood_score", 5) for entry in user_history]
-            average_mood = sum(mood_scores) / len(mood_scores)
+            average_mood, recent_avg, earlier_avg, low_count, high_count = stats
             
             # Determine trend
-            if len(mood_scores) >= 3:
-                recent_avg = sum(mood_scores[-3:]) / 3
-                earlier_avg = sum(mood_scores[:3]) / 3
-                
+            if mood_scores.size >= 3:
                 if recent_avg > earlier_avg + 1:
                     trend = "improving"
                 elif recent_avg < earlier_avg - 1:
@@ -347,14 +1054,12 @@ async def handle_mood_analysis_request(ctx: Context, sender: str, msg: MoodAnaly
             
             # Check for patterns
             patterns = []
-            if len(mood_scores) >= 7:
+            if mood_scores.size >= 7:
                 # Check for weekly patterns
-                low_count = sum(1 for score in mood_scores if score <= 3)
-                if low_count >= len(mood_scores) * 0.4:
+                if low_count >= mood_scores.size * 0.4:
                     patterns.append("frequent_low_moods")
                 
-                high_count = sum(1 for score in mood_scores if score >= 8)
-                if high_count >= len(mood_scores) * 0.6:
+                if high_count >= mood_scores.size * 0.6:
                     patterns.append("generally_positive")
             
             # Determine intervention needs
@@ -369,11 +1074,7 @@ async def handle_mood_analysis_request(ctx: Context, sender: str, msg: MoodAnaly
             
             if needs_intervention:
                 alerts.append("intervention_recommended")
-                recommendations.extend([
-                    "professional_consultation",
-                    "mood_tracking_continuation",
-                    "coping_strategies_review"
-                ])
+                recommendations.extend(_INTERVENTION_RECS)
             
             if average_mood < 3:
                 alerts.append("persistent_low_mood")
@@ -392,7 +1093,7 @@ async def handle_mood_analysis_request(ctx: Context, sender: str, msg: MoodAnaly
         await ctx.send(sender, response)
         
     except Exception as e:
-        ctx.logger.error(f"Error processing mood analysis request: {str(e)}")
+        ctx.logger.error("Error processing mood analysis request: %s", e)
 
 # Include the mood protocol in the agent
 mood_tracker.include(mood_protocol)
@@ -401,15 +1102,35 @@ mood_tracker.include(mood_protocol)
 async def startup_handler(ctx: Context):
     """Agent startup handler."""
     ctx.logger.info("🧠 Mental Wellness Mood Tracker Agent starting up...")
-    ctx.logger.info(f"Agent address: {mood_tracker.address}")
+    ctx.logger.info("Agent address: %s", mood_tracker.address)
+    
+    # Trigger JIT compilation before the first real reading arrives
+    _mood_stats(np.zeros(3, dtype=np.int64), LOW_MOOD_THR, HIGH_MOOD_THR)
+    
+    global _entry_worker
+    if _entry_worker is None:
+        _entry_worker = asyncio.create_task(run_mood_entry_worker(ctx))
+    
     ctx.logger.info("Ready to track moods and provide mental wellness insights!")
 
 @mood_tracker.on_event("shutdown")
 async def shutdown_handler(ctx: Context):
     """Agent shutdown handler."""
     ctx.logger.info("🧠 Mental Wellness Mood Tracker Agent shutting down...")
+    
+    global _entry_worker
+    if _entry_worker is not None:
+        _entry_worker.cancel()
+        try:
+            await _entry_worker
+        except asyncio.CancelledError:
+            pass
+        _entry_worker = None
 
 if __name__ == "__main__":
+    # Configure logging only when run as a script so importers keep their own setup
+    logging.basicConfig(level=logging.INFO)
+    
     print("🚀 Starting Mental Wellness Mood Tracker Agent for Agentverse...")
     print(f"📊 Agent Address: {mood_tracker.address}")
     print(f"🌐 Port: {MOOD_TRACKER_PORT}")
@@ -6,29 +6,217 @@ communication between specialized mental wellness agents.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, List, Optional, Any, Set
-from datetime import datetime
+import re
+import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
+from itertools import count, islice
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from services.agent_service import (
-    MentalWellnessAgent, 
-    AgentConfiguration, 
-    AgentType, 
-    AgentMessage
+    AgentConfiguration,
+    AgentMessage,
+    AgentType,
+    MentalWellnessAgent,
 )
-from services.llm_service import ASILLMService, create_conversation_context, LLMResponse
+from services.llm_service import ASILLMService, LLMResponse, create_conversation_context
 
 try:
     from uagents import Context
 except ImportError:
     Context = None
 
+try:
+    import ahocorasick
+
+    HAS_AHOCORASICK = True
+except ImportError:
+    # Fallback to per-token lookups and phrase searches when pyahocorasick is not available
+    ahocorasick = None
+    HAS_AHOCORASICK = False
+
 logger = logging.getLogger(__name__)
 
+# Keyword groups matched against a message's words
+_STRESS_KEYWORDS = frozenset({"stressed", "anxiety", "anxious", "overwhelmed"})
+_HIGH_STRESS_KEYWORDS = frozenset({"stressed", "overwhelmed", "anxious"})
+_JOURNAL_KEYWORDS = frozenset(
+    {
+        "write",
+        "writing",
+        "journal",
+        "journaling",
+        "reflect",
+        "reflecting",
+        "think",
+        "thinking",
+    }
+)
+_CRISIS_WORDS = frozenset({"suicide", "hopeless"})
+
+# Multi-word crisis phrases cannot match a single token, so they are searched as text
+_CRISIS_PHRASES = ("hurt myself", "end it all")
+_CRISIS_DETECTOR_PHRASES = _CRISIS_PHRASES + ("no point",)
+
+_MOOD_KEYWORDS = {
+    "sad": ("sad", "down", "depressed", "blue"),
+    "anxious": ("anxious", "worried", "nervous", "stressed"),
+    "angry": ("angry", "frustrated", "mad", "irritated"),
+    "happy": ("happy", "good", "great", "wonderful"),
+    "tired": ("tired", "exhausted", "drained", "weary"),
+}
+
+# Keyword groups scanned together; mood names double as their group's tag
+_KEYWORD_GROUPS = {
+    "stress": _STRESS_KEYWORDS,
+    "high_stress": _HIGH_STRESS_KEYWORDS,
+    "journal": _JOURNAL_KEYWORDS,
+    "crisis": _CRISIS_WORDS.union(_CRISIS_PHRASES),
+    "crisis_detector": _CRISIS_WORDS.union(_CRISIS_DETECTOR_PHRASES),
+    "mood_request": ("mood",),
+    **_MOOD_KEYWORDS,
+}
+
+
+def _build_keyword_tags() -> Dict[str, FrozenSet[str]]:
+    """Invert the keyword groups into keyword -> tags."""
+    keyword_tags: Dict[str, Set[str]] = {}
+    for tag, keywords in _KEYWORD_GROUPS.items():
+        for keyword in keywords:
+            keyword_tags.setdefault(keyword, set()).add(tag)
+    return {keyword: frozenset(tags) for keyword, tags in keyword_tags.items()}
+
+
+_KEYWORD_TAGS = _build_keyword_tags()
+
+# Crisis keywords keep substring semantics so "hopelessness" still counts as
+# "hopeless"; other single words must match whole tokens
+_SUBSTRING_TAGS = frozenset({"crisis", "crisis_detector"})
+_SCAN_SUBSTRINGS = tuple(
+    keyword
+    for keyword, tags in _KEYWORD_TAGS.items()
+    if " " in keyword or not tags.isdisjoint(_SUBSTRING_TAGS)
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _build_keyword_automaton():
+    """Compile all keywords into one Aho-Corasick automaton, if available."""
+    if not HAS_AHOCORASICK:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword, tags in _KEYWORD_TAGS.items():
+        automaton.add_word(keyword, (keyword, tags, keyword not in _SCAN_SUBSTRINGS))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AC = _build_keyword_automaton()
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the ``\\w`` character class used for tokenizing."""
+    return char.isalnum() or char == "_"
+
+
+def _scan(message_lower: str) -> Dict[str, Set[str]]:
+    """
+    Scan a lowercased message for every keyword group in one pass.
+
+    Returns:
+        Mapping of tag to the keywords that matched it
+    """
+    found: Dict[str, Set[str]] = {}
+    if _KEYWORD_AC is not None:
+        last = len(message_lower) - 1
+        for end, (keyword, tags, whole_word) in _KEYWORD_AC.iter(message_lower):
+            if whole_word:
+                start = end - len(keyword) + 1
+                if (start > 0 and _is_word_char(message_lower[start - 1])) or (
+                    end < last and _is_word_char(message_lower[end + 1])
+                ):
+                    continue
+            for tag in tags:
+                found.setdefault(tag, set()).add(keyword)
+        return found
+
+    for token in _TOKEN_RE.findall(message_lower):
+        tags = _KEYWORD_TAGS.get(token)
+        if tags:
+            for tag in tags:
+                found.setdefault(tag, set()).add(token)
+    for keyword in _SCAN_SUBSTRINGS:
+        if keyword in message_lower:
+            for tag in _KEYWORD_TAGS[keyword]:
+                found.setdefault(tag, set()).add(keyword)
+    return found
+
+
+# Agents every conversation of a given type starts with; crisis detection is always on
+_DEFAULT_TYPE_AGENTS = frozenset({"crisis_detector"})
+_TYPE_AGENTS = {
+    "mood_check": frozenset({"mood_tracker", "crisis_detector"}),
+    "mental_health": frozenset({"mood_tracker", "crisis_detector"}),
+    "general": frozenset({"mood_tracker", "crisis_detector"}),
+    "coping": frozenset({"crisis_detector", "coping_advisor"}),
+    "journaling": frozenset({"crisis_detector", "journaling_assistant"}),
+}
+
+# Disambiguates generated session ids created within the same nanosecond tick
+_SESSION_COUNTER = count()
+
+# Upper bound on history entries kept per live conversation (two per exchange)
+MAX_CONVERSATION_HISTORY = 200
+
+# Number of non-personalized LLM responses kept for repeated opening messages
+_RESPONSE_CACHE_MAX = 1024
+
+# Ended conversations waiting for the background archiver
+_ARCHIVE_QUEUE_MAX = 1024
+
+# Insight fields whose entries are merged into the response's suggested actions
+_INSIGHT_ACTION_KEYS = (
+    "recommendations",
+    "coping_strategies",
+    "safety_recommendations",
+)
+
+
+def _norm(message: str) -> str:
+    """Normalize a user message once for all keyword scans and cache keys."""
+    return message.lower() if message else ""
+
+
+def _make_conv_response_payload(
+    response: LLMResponse, session_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the payload shared by conversation_started and conversation_response messages."""
+    payload = {
+        "response": response.text,
+        "suggested_actions": response.suggested_actions,
+        "conversation_tags": response.conversation_tags,
+        "crisis_level": response.crisis_level,
+    }
+    if session_id:
+        payload["session_id"] = session_id
+    return payload
+
+
+def _recent_history(history, count: int) -> List[Dict[str, str]]:
+    """Return the last ``count`` history entries as a list without copying the rest."""
+    return list(islice(history, max(0, len(history) - count), None))
+
+
 class ConversationState(Enum):
     """States of conversation coordination."""
+
     INITIALIZING = "initializing"
     ACTIVE = "active"
     MOOD_FOCUSED = "mood_focused"
@@ -36,9 +224,11 @@ class ConversationState(Enum):
     ENDING = "ending"
     COMPLETED = "completed"
 
-@dataclass
+
+@dataclass(slots=True)
 class ActiveConversation:
-    """Active conversation management data."""
+    """Active conversation management data (slotted; one instance per live session)."""
+
     user_id: str
     session_id: str
     state: ConversationState
@@ -47,15 +237,19 @@ class ActiveConversation:
     last_activity: datetime
     context_data: Dict[str, Any]
     intervention_level: str = "none"  # none, low, medium, high, crisis
-    
+    started_at: Optional[datetime] = None
+
     def __post_init__(self):
         if isinstance(self.participating_agents, list):
             self.participating_agents = set(self.participating_agents)
+        if self.started_at is None:
+            self.started_at = self.last_activity
+
 
 class ConversationCoordinatorAgent(MentalWellnessAgent):
     """
     Central coordination agent for mental wellness conversations.
-    
+
     Responsibilities:
     - Coordinate conversation flow between agents
     - Manage conversation state and context
@@ -63,79 +257,159 @@ class ConversationCoordinatorAgent(MentalWellnessAgent):
     - Integrate responses from multiple agents
     - Handle escalation and crisis coordination
     """
-    
+
+    # Message type -> handler method name, registered in one update per instance
+    _HANDLERS: Tuple[Tuple[str, str], ...] = (
+        # Conversation lifecycle
+        ("start_conversation", "_handle_start_conversation"),
+        ("continue_conversation", "_handle_continue_conversation"),
+        ("end_conversation", "_handle_end_conversation"),
+        # Crisis and alerts
+        ("mood_alert", "_handle_mood_alert"),
+        ("crisis_alert", "_handle_crisis_alert"),
+    )
+
     def __init__(self, config: AgentConfiguration):
         """Initialize the conversation coordinator agent."""
         super().__init__(config)
-        
+
         # Conversation management
         self.active_conversations: Dict[str, ActiveConversation] = {}
+        # Secondary indexes so alerts find a user's sessions without scanning
+        self._sessions_by_user: Dict[str, Set[str]] = {}
+        self._latest_session_by_user: Dict[str, str] = {}
+        # LRU of LLM responses for repeated, non-personalized messages
+        self._response_cache: "OrderedDict[str, LLMResponse]" = OrderedDict()
+        # Ended conversations are archived in the background, off the response path
+        self._archive_queue: asyncio.Queue = asyncio.Queue(maxsize=_ARCHIVE_QUEUE_MAX)
+        self._archive_worker: Optional[asyncio.Task] = None
+        # Per-session locks serialize turns within a session, never across sessions
+        self._session_locks: Dict[str, asyncio.Lock] = {}
         self.agent_capabilities = {
             "mood_tracker": ["mood_analysis", "mood_patterns", "mood_recommendations"],
-            "coping_advisor": ["coping_strategies", "stress_management", "relaxation_techniques"],
-            "journaling_assistant": ["journaling_prompts", "reflection_guidance", "emotional_processing"],
-            "crisis_detector": ["risk_assessment", "safety_planning", "crisis_intervention"],
-            "escalation_manager": ["professional_referral", "emergency_response", "follow_up_care"]
+            "coping_advisor": [
+                "coping_strategies",
+                "stress_management",
+                "relaxation_techniques",
+            ],
+            "journaling_assistant": [
+                "journaling_prompts",
+                "reflection_guidance",
+                "emotional_processing",
+            ],
+            "crisis_detector": [
+                "risk_assessment",
+                "safety_planning",
+                "crisis_intervention",
+            ],
+            "escalation_manager": [
+                "professional_referral",
+                "emergency_response",
+                "follow_up_care",
+            ],
         }
-        
+
         # LLM service for conversation generation
         self.llm_service = ASILLMService()
-        
+
         # Register coordinator-specific message handlers
         self._register_coordinator_handlers()
-    
+
     def _register_coordinator_handlers(self) -> None:
         """Register message handlers for conversation coordination."""
-        # Conversation lifecycle
-        self.register_message_handler("start_conversation", self._handle_start_conversation)
-        self.register_message_handler("continue_conversation", self._handle_continue_conversation)
-        self.register_message_handler("end_conversation", self._handle_end_conversation)
-        
-        # Agent coordination
-        self.register_message_handler("agent_response", self._handle_agent_response)
-        self.register_message_handler("request_agent_consultation", self._handle_agent_consultation)
-        
-        # Crisis and alerts
-        self.register_message_handler("mood_alert", self._handle_mood_alert)
-        self.register_message_handler("crisis_alert", self._handle_crisis_alert)
-        
-        # User interaction
-        self.register_message_handler("user_message", self._handle_user_message)
-    
+        self.message_handlers.update(
+            {
+                message_type: getattr(self, method_name)
+                for message_type, method_name in self._HANDLERS
+            }
+        )
+        logger.info(
+            "Registered %d conversation coordinator handlers", len(self._HANDLERS)
+        )
+
     async def _on_startup(self, ctx: Context) -> None:
         """Initialize conversation coordinator."""
         logger.info("Conversation Coordinator Agent starting up...")
-        
+
         # Initialize agent registry awareness
         await self._discover_available_agents()
-        
+
+        # Start the background archiver
+        if self._archive_worker is None:
+            self._archive_worker = asyncio.create_task(self._run_archive_worker())
+
         if ctx:
             ctx.logger.info("Conversation coordination services initialized")
-    
+
+    async def _on_shutdown(self, ctx: Context) -> None:
+        """Stop the background archiver and archive anything still queued."""
+        if self._archive_worker is not None:
+            self._archive_worker.cancel()
+            try:
+                await self._archive_worker
+            except asyncio.CancelledError:
+                pass
+            self._archive_worker = None
+
+        while not self._archive_queue.empty():
+            conversation, ended_at = self._archive_queue.get_nowait()
+            await self._archive_conversation(conversation, ended_at=ended_at)
+            self._archive_queue.task_done()
+
+    async def _queue_archive(
+        self, conversation: ActiveConversation, ended_at: datetime
+    ) -> None:
+        """Hand a conversation to the archiver; archive inline if it is stopped or backed up."""
+        if self._archive_worker is not None:
+            try:
+                self._archive_queue.put_nowait((conversation, ended_at))
+                return
+            except asyncio.QueueFull:
+                logger.warning(
+                    "Archive queue full, archiving conversation %s inline",
+                    conversation.session_id,
+                )
+        await self._archive_conversation(conversation, ended_at=ended_at)
+
+    async def _run_archive_worker(self) -> None:
+        """Archive ended conversations as they are queued."""
+        while True:
+            conversation, ended_at = await self._archive_queue.get()
+            try:
+                await self._archive_conversation(conversation, ended_at=ended_at)
+            finally:
+                self._archive_queue.task_done()
+
     async def _discover_available_agents(self) -> None:
         """Discover and register available mental wellness agents."""
         # This would integrate with the agent registry to discover available agents
         logger.info("Discovering available mental wellness agents...")
-        
+
         # For now, we'll use the predefined capabilities
         available_agents = list(self.agent_capabilities.keys())
-        logger.info(f"Available agents: {available_agents}")
-    
-    async def _handle_start_conversation(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+        logger.info("Available agents: %s", available_agents)
+
+    async def _handle_start_conversation(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """
         Handle conversation start request.
-        
+
         Args:
             ctx: Agent context
             sender: Sender address
             msg: Message with conversation start data
         """
         try:
+            now = datetime.utcnow()
             user_id = msg.user_id
-            session_id = msg.session_id or f"session_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{user_id}"
+            session_id = (
+                msg.session_id
+                or f"session_{time.time_ns()}_{next(_SESSION_COUNTER)}_{user_id}"
+            )
             conversation_type = msg.payload.get("conversation_type", "general")
             initial_message = msg.payload.get("initial_message", "")
-            
+
             # Create active conversation
             conversation = ActiveConversation(
                 user_id=user_id,
@@ -143,139 +417,165 @@ class ConversationCoordinatorAgent(MentalWellnessAgent):
                 state=ConversationState.INITIALIZING,
                 participating_agents={"conversation_coordinator"},
                 conversation_type=conversation_type,
-                last_activity=datetime.utcnow(),
+                last_activity=now,
                 context_data={
-                    "conversation_history": [],
+                    "conversation_history": deque(maxlen=MAX_CONVERSATION_HISTORY),
                     "user_preferences": msg.payload.get("user_preferences", {}),
                     "mood_context": msg.payload.get("mood_context", {}),
-                    "initial_message": initial_message
-                }
+                    "initial_message": initial_message,
+                },
             )
-            
+
+            previous = self.active_conversations.get(session_id)
+            if previous is not None:
+                self._unindex_session(previous)
             self.active_conversations[session_id] = conversation
-            
+            self._sessions_by_user.setdefault(user_id, set()).add(session_id)
+            self._latest_session_by_user[user_id] = session_id
+
             # Determine which agents to involve
-            agents_to_involve = await self._determine_required_agents(conversation_type, initial_message)
+            message_lower = _norm(initial_message)
+            tags = _scan(message_lower)
+            agents_to_involve = await self._determine_required_agents(
+                conversation_type, initial_message, tags=tags
+            )
             conversation.participating_agents.update(agents_to_involve)
-            
+
             # Generate initial response
-            response = await self._generate_coordinated_response(conversation, initial_message)
-            
+            response = await self._generate_coordinated_response(
+                conversation, initial_message, message_lower, tags
+            )
+
             # Update conversation state
             conversation.state = ConversationState.ACTIVE
-            conversation.last_activity = datetime.utcnow()
-            
+            conversation.last_activity = now
+
             # Send response back
+            payload = _make_conv_response_payload(response, session_id)
+            payload["conversation_type"] = conversation_type
+            payload["participating_agents"] = list(conversation.participating_agents)
             response_msg = AgentMessage(
                 message_type="conversation_started",
                 sender_agent=self.config.name,
                 recipient_agent=sender,
-                payload={
-                    "session_id": session_id,
-                    "response": response.text,
-                    "conversation_type": conversation_type,
-                    "participating_agents": list(conversation.participating_agents),
-                    "suggested_actions": response.suggested_actions,
-                    "conversation_tags": response.conversation_tags
-                },
+                payload=payload,
                 user_id=user_id,
-                session_id=session_id
+                session_id=session_id,
             )
-            
+
             await self.send_message_to_agent(sender, response_msg)
-            logger.info(f"Started conversation {session_id} for user {user_id}")
-            
+            logger.info("Started conversation %s for user %s", session_id, user_id)
+
         except Exception as e:
-            logger.error(f"Error starting conversation: {str(e)}")
-    
-    async def _determine_required_agents(self, conversation_type: str, initial_message: str) -> Set[str]:
+            logger.error("Error starting conversation: %s", e)
+
+    async def _determine_required_agents(
+        self,
+        conversation_type: str,
+        initial_message: str,
+        tags: Optional[Dict[str, Set[str]]] = None,
+    ) -> Set[str]:
         """
         Determine which agents should participate in the conversation.
-        
+
         Args:
             conversation_type: Type of conversation
             initial_message: Initial user message
-            
+            tags: Keyword tags of the initial message, if already scanned
+
         Returns:
             Set of agent names to involve
         """
-        agents = set()
-        
-        # Always include mood tracker for mental health conversations
-        if conversation_type in ["mood_check", "mental_health", "general"]:
-            agents.add("mood_tracker")
-        
-        # Crisis detection for all conversations
-        agents.add("crisis_detector")
-        
-        # Type-specific agents
-        if conversation_type == "coping":
+        # Mood tracking, crisis detection and type-specific agents
+        agents = set(_TYPE_AGENTS.get(conversation_type, _DEFAULT_TYPE_AGENTS))
+        if not initial_message:
+            return agents
+
+        # Message content analysis for additional agents
+        if tags is None:
+            tags = _scan(_norm(initial_message))
+
+        if "stress" in tags:
             agents.add("coping_advisor")
-        elif conversation_type == "journaling":
+
+        if "journal" in tags:
             agents.add("journaling_assistant")
-        
-        # Message content analysis for additional agents
-        if initial_message:
-            message_lower = initial_message.lower()
-            
-            if any(word in message_lower for word in ["stressed", "anxiety", "anxious", "overwhelmed"]):
-                agents.add("coping_advisor")
-            
-            if any(word in message_lower for word in ["write", "journal", "reflect", "think"]):
-                agents.add("journaling_assistant")
-            
-            # Crisis keywords
-            crisis_keywords = ["suicide", "hurt myself", "hopeless", "end it all"]
-            if any(keyword in message_lower for keyword in crisis_keywords):
-                agents.add("escalation_manager")
-        
+
+        # Crisis keywords
+        if "crisis" in tags:
+            agents.add("escalation_manager")
+
         return agents
-    
-    async def _generate_coordinated_response(self, conversation: ActiveConversation, user_message: str) -> LLMResponse:
+
+    async def _generate_coordinated_response(
+        self,
+        conversation: ActiveConversation,
+        user_message: str,
+        message_lower: str,
+        tags: Dict[str, Set[str]],
+    ) -> LLMResponse:
         """
         Generate a coordinated response using ASI LLM and agent insights.
-        
+
         Args:
             conversation: Active conversation data
             user_message: User's message
-            
+            message_lower: Normalized user message
+            tags: Keyword tags scanned from the user message
+
         Returns:
             Generated LLM response
         """
         try:
             # Gather insights from participating agents
-            agent_insights = await self._gather_agent_insights(conversation, user_message)
-            
+            agent_insights = await self._gather_agent_insights(
+                conversation, user_message, tags
+            )
+
             # Create conversation context for LLM
             context = create_conversation_context(
                 user_id=conversation.user_id,
                 session_id=conversation.session_id,
-                conversation_history=conversation.context_data.get("conversation_history", []),
+                conversation_history=list(
+                    conversation.context_data.get("conversation_history", ())
+                ),
                 mood_context=conversation.context_data.get("mood_context", {}),
-                user_profile=conversation.context_data.get("user_preferences", {})
+                user_profile=conversation.context_data.get("user_preferences", {}),
             )
-            
+
             # Add agent insights to context
             if agent_insights:
                 context.metadata = {"agent_insights": agent_insights}
-            
-            # Generate response using LLM service
-            response = await self.llm_service.generate_response(user_message, context)
-            
+
+            # Generate response using LLM service, reusing a cached answer for common openers
+            cache_key = self._response_cache_key(
+                conversation, message_lower, agent_insights
+            )
+            response = self._get_cached_response(cache_key, conversation)
+            if response is None:
+                response = await self.llm_service.generate_response(
+                    user_message, context
+                )
+                self._cache_response(cache_key, response)
+
             # Enhance response with agent recommendations
             if agent_insights:
-                response = await self._enhance_response_with_insights(response, agent_insights)
-            
+                response = await self._enhance_response_with_insights(
+                    response, agent_insights
+                )
+
             # Update conversation history
-            conversation.context_data["conversation_history"].extend([
-                {"role": "user", "content": user_message},
-                {"role": "assistant", "content": response.text}
-            ])
-            
+            conversation.context_data["conversation_history"].extend(
+                [
+                    {"role": "user", "content": user_message},
+                    {"role": "assistant", "content": response.text},
+                ]
+            )
+
             return response
-            
+
         except Exception as e:
-            logger.error(f"Error generating coordinated response: {str(e)}")
+            logger.error("Error generating coordinated response: %s", e)
             # Return fallback response
             return LLMResponse(
                 text="I'm here to support you. Could you tell me more about how you're feeling?",
@@ -283,28 +583,103 @@ class ConversationCoordinatorAgent(MentalWellnessAgent):
                 crisis_level="none",
                 suggested_actions=["Continue sharing", "Take a moment to breathe"],
                 conversation_tags=["fallback"],
-                metadata={"error": str(e)}
+                metadata={"error": str(e)},
             )
-    
-    async def _gather_agent_insights(self, conversation: ActiveConversation, user_message: str) -> Dict[str, Any]:
+
+    def _response_cache_key(
+        self,
+        conversation: ActiveConversation,
+        message_lower: str,
+        agent_insights: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Build the response cache key for a message, or None if it must not be cached.
+
+        Only first turns without user preferences or mood context are cacheable,
+        and anything containing a crisis keyword always goes to the LLM. The agent
+        insights are part of the LLM context, so they are part of the key too.
+        """
+        context_data = conversation.context_data
+        if (
+            context_data.get("conversation_history")
+            or context_data.get("user_preferences")
+            or context_data.get("mood_context")
+        ):
+            return None
+
+        normalized = " ".join(message_lower.split())
+        if not normalized or any(
+            keyword in normalized for keyword in self.llm_service.crisis_keywords
+        ):
+            return None
+
+        insights = json.dumps(agent_insights, sort_keys=True, default=str)
+        return hashlib.blake2b(
+            f"{conversation.conversation_type}|{normalized}|{insights}".encode(),
+            digest_size=16,
+        ).hexdigest()
+
+    def _get_cached_response(
+        self, cache_key: Optional[str], conversation: ActiveConversation
+    ) -> Optional[LLMResponse]:
+        """Return a private copy of a cached response, refreshed for this conversation."""
+        if cache_key is None:
+            return None
+        cached = self._response_cache.get(cache_key)
+        if cached is None:
+            return None
+        self._response_cache.move_to_end(cache_key)
+
+        response = cached.model_copy(deep=True)
+        response.metadata["timestamp"] = datetime.utcnow().isoformat()
+        response.metadata["cached"] = True
+        if "user_id" in response.metadata:
+            response.metadata["user_id"] = conversation.user_id
+        if "session_id" in response.metadata:
+            response.metadata["session_id"] = conversation.session_id
+        return response
+
+    def _cache_response(self, cache_key: Optional[str], response: LLMResponse) -> None:
+        """Store a copy of a successful, non-crisis LLM response."""
+        if (
+            cache_key is None
+            or response.crisis_level != "none"
+            or response.metadata.get("is_error")
+        ):
+            return
+        self._response_cache[cache_key] = response.model_copy(deep=True)
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > _RESPONSE_CACHE_MAX:
+            self._response_cache.popitem(last=False)
+
+    async def _gather_agent_insights(
+        self,
+        conversation: ActiveConversation,
+        user_message: str,
+        tags: Dict[str, Set[str]],
+    ) -> Dict[str, Any]:
         """
         Gather insights from participating agents.
-        
+
         Args:
             conversation: Active conversation
             user_message: User's message
-            
+            tags: Keyword tags scanned from the user message
+
         Returns:
             Compiled insights from agents
         """
         insights = {}
-        
+
         try:
+            agent_names = [
+                agent_name
+                for agent_name in conversation.participating_agents
+                if agent_name != "conversation_coordinator"
+            ]
+
             # Request insights from each participating agent
-            for agent_name in conversation.participating_agents:
-                if agent_name == "conversation_coordinator":
-                    continue
-                
+            for agent_name in agent_names:
                 # Send consultation request
                 consultation_msg = AgentMessage(
                     message_type="consultation_request",
@@ -313,194 +688,252 @@ class ConversationCoordinatorAgent(MentalWellnessAgent):
                     payload={
                         "user_message": user_message,
                         "conversation_type": conversation.conversation_type,
-                        "conversation_history": conversation.context_data.get("conversation_history", [])[-5:],  # Last 5 exchanges
-                        "context": conversation.context_data
+                        "conversation_history": _recent_history(
+                            conversation.context_data.get("conversation_history", ()), 5
+                        ),  # Last 5 exchanges
+                        "context": conversation.context_data,
                     },
                     user_id=conversation.user_id,
                     session_id=conversation.session_id,
-                    requires_response=True
+                    requires_response=True,
                 )
-                
-                # Note: In a real implementation, we'd await responses from agents
-                # For now, we'll simulate insights based on agent capabilities
-                insights[agent_name] = await self._simulate_agent_insight(agent_name, user_message, conversation)
-            
+
+            # Note: In a real implementation, we'd await responses from agents
+            # For now, we'll simulate insights based on agent capabilities.
+            # Consultations are independent, so they run concurrently.
+            results = await asyncio.gather(
+                *(
+                    self._simulate_agent_insight(agent_name, tags, conversation)
+                    for agent_name in agent_names
+                ),
+                return_exceptions=True,
+            )
+
+            for agent_name, result in zip(agent_names, results):
+                if isinstance(result, Exception):
+                    logger.error("Error consulting agent %s: %s", agent_name, result)
+                    continue
+                insights[agent_name] = result
+
             return insights
-            
+
         except Exception as e:
-            logger.error(f"Error gathering agent insights: {str(e)}")
+            logger.error("Error gathering agent insights: %s", e)
             return {}
-    
-    async def _simulate_agent_insight(self, agent_name: str, user_message: str, conversation: ActiveConversation) -> Dict[str, Any]:
+
+    async def _simulate_agent_insight(
+        self,
+        agent_name: str,
+        tags: Dict[str, Set[str]],
+        conversation: ActiveConversation,
+    ) -> Dict[str, Any]:
         """Simulate agent insights for development purposes."""
-        message_lower = user_message.lower()
-        
         if agent_name == "mood_tracker":
             return {
-                "mood_indicators": self._extract_mood_indicators(message_lower),
-                "recommendations": ["track_daily_mood", "identify_patterns"] if "mood" in message_lower else []
+                "mood_indicators": self._extract_mood_indicators(tags),
+                "recommendations": ["track_daily_mood", "identify_patterns"]
+                if "mood_request" in tags
+                else [],
             }
         elif agent_name == "coping_advisor":
-            stress_level = "high" if any(word in message_lower for word in ["stressed", "overwhelmed", "anxious"]) else "moderate"
+            stress_level = "high" if "high_stress" in tags else "moderate"
             return {
                 "stress_level": stress_level,
-                "coping_strategies": ["deep_breathing", "grounding_exercise"] if stress_level == "high" else ["mindfulness"]
+                "coping_strategies": ["deep_breathing", "grounding_exercise"]
+                if stress_level == "high"
+                else ["mindfulness"],
             }
         elif agent_name == "crisis_detector":
-            crisis_keywords = ["suicide", "hurt myself", "hopeless", "end it all", "no point"]
-            risk_level = "high" if any(keyword in message_lower for keyword in crisis_keywords) else "low"
+            risk_level = "high" if "crisis_detector" in tags else "low"
             return {
                 "risk_level": risk_level,
-                "safety_recommendations": ["immediate_support", "crisis_resources"] if risk_level == "high" else []
+                "safety_recommendations": ["immediate_support", "crisis_resources"]
+                if risk_level == "high"
+                else [],
             }
-        
+
         return {"status": "consulted"}
-    
-    def _extract_mood_indicators(self, message: str) -> List[str]:
-        """Extract mood indicators from message."""
-        mood_keywords = {
-            "sad": ["sad", "down", "depressed", "blue"],
-            "anxious": ["anxious", "worried", "nervous", "stressed"],
-            "angry": ["angry", "frustrated", "mad", "irritated"],
-            "happy": ["happy", "good", "great", "wonderful"],
-            "tired": ["tired", "exhausted", "drained", "weary"]
-        }
-        
-        indicators = []
-        for mood, keywords in mood_keywords.items():
-            if any(keyword in message for keyword in keywords):
-                indicators.append(mood)
-        
-        return indicators
-    
-    async def _enhance_response_with_insights(self, response: LLMResponse, insights: Dict[str, Any]) -> LLMResponse:
+
+    def _extract_mood_indicators(self, tags: Dict[str, Set[str]]) -> List[str]:
+        """Extract mood indicators from a message's scanned keyword tags."""
+        # Report moods in declaration order
+        return [mood for mood in _MOOD_KEYWORDS if mood in tags]
+
+    async def _enhance_response_with_insights(
+        self, response: LLMResponse, insights: Dict[str, Any]
+    ) -> LLMResponse:
         """
         Enhance LLM response with agent insights.
-        
+
         Args:
             response: Original LLM response
             insights: Insights from agents
-            
+
         Returns:
             Enhanced response
         """
-        # Combine suggested actions from agents
-        additional_actions = []
-        for agent_name, agent_insight in insights.items():
-            if isinstance(agent_insight, dict):
-                if "recommendations" in agent_insight:
-                    additional_actions.extend(agent_insight["recommendations"])
-                if "coping_strategies" in agent_insight:
-                    additional_actions.extend(agent_insight["coping_strategies"])
-                if "safety_recommendations" in agent_insight:
-                    additional_actions.extend(agent_insight["safety_recommendations"])
-        
-        # Update response with additional insights
-        response.suggested_actions.extend(additional_actions)
+        # Combine suggested actions from agents and note any high-risk assessment in one pass
+        actions = response.suggested_actions
+        high_risk = False
+        for agent_insight in insights.values():
+            if not isinstance(agent_insight, dict):
+                continue
+            for key in _INSIGHT_ACTION_KEYS:
+                agent_actions = agent_insight.get(key)
+                if agent_actions:
+                    actions.extend(agent_actions)
+            if not high_risk and agent_insight.get("risk_level") == "high":
+                high_risk = True
+
         response.metadata["agent_insights"] = insights
-        
+
         # Update crisis level if any agent detected high risk
-        for agent_insight in insights.values():
-            if isinstance(agent_insight, dict) and agent_insight.get("risk_level") == "high":
-                response.crisis_level = "high"
-                break
-        
+        if high_risk:
+            response.crisis_level = "high"
+
         return response
-    
-    async def _handle_continue_conversation(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+
+    async def _handle_continue_conversation(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """Handle conversation continuation."""
         try:
             session_id = msg.session_id
             user_message = msg.payload.get("message", "")
-            
+
             if session_id not in self.active_conversations:
-                logger.warning(f"No active conversation found for session {session_id}")
+                logger.warning(
+                    "No active conversation found for session %s", session_id
+                )
                 return
-            
+
             conversation = self.active_conversations[session_id]
-            conversation.last_activity = datetime.utcnow()
-            
-            # Generate coordinated response
-            response = await self._generate_coordinated_response(conversation, user_message)
-            
+
+            async with self._lock_for(session_id):
+                # The session may have ended or been replaced while waiting for the lock
+                if self.active_conversations.get(session_id) is not conversation:
+                    logger.warning(
+                        "Conversation %s ended before message could be handled",
+                        session_id,
+                    )
+                    return
+
+                conversation.last_activity = datetime.utcnow()
+                self._latest_session_by_user[conversation.user_id] = session_id
+
+                # Generate coordinated response
+                message_lower = _norm(user_message)
+                response = await self._generate_coordinated_response(
+                    conversation, user_message, message_lower, _scan(message_lower)
+                )
+
             # Send response
             response_msg = AgentMessage(
                 message_type="conversation_response",
                 sender_agent=self.config.name,
                 recipient_agent=sender,
-                payload={
-                    "response": response.text,
-                    "suggested_actions": response.suggested_actions,
-                    "conversation_tags": response.conversation_tags,
-                    "crisis_level": response.crisis_level
-                },
+                payload=_make_conv_response_payload(response),
                 user_id=conversation.user_id,
-                session_id=session_id
+                session_id=session_id,
             )
-            
+
             await self.send_message_to_agent(sender, response_msg)
-            
+
         except Exception as e:
-            logger.error(f"Error continuing conversation: {str(e)}")
-    
-    async def _handle_mood_alert(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+            logger.error("Error continuing conversation: %s", e)
+
+    def _lock_for(self, session_id: str) -> asyncio.Lock:
+        """Return the lock guarding a session's conversation state."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        return lock
+
+    def _find_user_conversation(self, user_id: str) -> Optional[ActiveConversation]:
+        """Return the user's most recently active conversation, if any."""
+        session_id = self._latest_session_by_user.get(user_id)
+        return self.active_conversations.get(session_id) if session_id else None
+
+    def _unindex_session(self, conversation: ActiveConversation) -> None:
+        """Remove a conversation from the per-user session index."""
+        session_ids = self._sessions_by_user.get(conversation.user_id)
+        if session_ids is None:
+            return
+
+        session_ids.discard(conversation.session_id)
+        if not session_ids:
+            del self._sessions_by_user[conversation.user_id]
+            self._latest_session_by_user.pop(conversation.user_id, None)
+        elif (
+            self._latest_session_by_user.get(conversation.user_id)
+            == conversation.session_id
+        ):
+            # Fall back to the user's next most recently active session
+            self._latest_session_by_user[conversation.user_id] = max(
+                session_ids,
+                key=lambda sid: self.active_conversations[sid].last_activity,
+            )
+
+    async def _handle_mood_alert(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """Handle mood alerts from mood tracker agent."""
         try:
             user_id = msg.user_id
             alert_data = msg.payload
-            
-            logger.warning(f"Mood alert received for user {user_id}: {alert_data}")
-            
+
+            logger.warning("Mood alert received for user %s: %r", user_id, alert_data)
+
             # Find active conversation for this user
-            user_sessions = [conv for conv in self.active_conversations.values() if conv.user_id == user_id]
-            
-            if user_sessions:
-                conversation = user_sessions[0]  # Use most recent session
+            conversation = self._find_user_conversation(user_id)
+
+            if conversation is not None:
                 conversation.intervention_level = "medium"
                 conversation.state = ConversationState.MOOD_FOCUSED
-                
+
                 # Add coping advisor to conversation if not already present
                 conversation.participating_agents.add("coping_advisor")
-                
+
                 # Update context with mood alert
                 conversation.context_data["mood_alert"] = alert_data
-            
+
             # Acknowledge alert
             response = AgentMessage(
                 message_type="alert_acknowledged",
                 sender_agent=self.config.name,
                 recipient_agent=sender,
                 payload={"status": "acknowledged", "action": "conversation_adjusted"},
-                user_id=user_id
+                user_id=user_id,
             )
-            
+
             await self.send_message_to_agent(sender, response)
-            
+
         except Exception as e:
-            logger.error(f"Error handling mood alert: {str(e)}")
-    
-    async def _handle_crisis_alert(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+            logger.error("Error handling mood alert: %s", e)
+
+    async def _handle_crisis_alert(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """Handle crisis alerts with immediate escalation."""
         try:
             user_id = msg.user_id
             crisis_data = msg.payload
-            
-            logger.critical(f"CRISIS ALERT for user {user_id}: {crisis_data}")
-            
+
+            logger.critical("CRISIS ALERT for user %s: %r", user_id, crisis_data)
+
             # Find active conversation
-            user_sessions = [conv for conv in self.active_conversations.values() if conv.user_id == user_id]
-            
-            if user_sessions:
-                conversation = user_sessions[0]
+            conversation = self._find_user_conversation(user_id)
+
+            if conversation is not None:
                 conversation.intervention_level = "crisis"
                 conversation.state = ConversationState.CRISIS_HANDLING
-                
+
                 # Add escalation manager
                 conversation.participating_agents.add("escalation_manager")
-                
+
                 # Update context
                 conversation.context_data["crisis_alert"] = crisis_data
-            
+
             # Forward to escalation manager
             escalation_msg = AgentMessage(
                 message_type="crisis_escalation",
@@ -509,74 +942,83 @@ class ConversationCoordinatorAgent(MentalWellnessAgent):
                 payload=crisis_data,
                 user_id=user_id,
                 priority="urgent",
-                requires_response=True
+                requires_response=True,
             )
-            
+
             await self.send_message_to_agent("escalation_manager", escalation_msg)
-            
+
         except Exception as e:
-            logger.error(f"Error handling crisis alert: {str(e)}")
-    
-    async def _handle_end_conversation(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+            logger.error("Error handling crisis alert: %s", e)
+
+    async def _handle_end_conversation(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """Handle conversation end request."""
         try:
             session_id = msg.session_id
-            
-            if session_id in self.active_conversations:
-                conversation = self.active_conversations[session_id]
+
+            # Remove from active conversations
+            conversation = self.active_conversations.pop(session_id, None)
+            if conversation is not None:
                 conversation.state = ConversationState.COMPLETED
-                
-                # Archive conversation data
-                await self._archive_conversation(conversation)
-                
-                # Remove from active conversations
-                del self.active_conversations[session_id]
-                
-                logger.info(f"Ended conversation {session_id}")
-            
+                self._unindex_session(conversation)
+                self._session_locks.pop(session_id, None)
+
+                # Queue conversation data for archiving so the confirmation isn't delayed
+                await self._queue_archive(conversation, datetime.utcnow())
+
+                logger.info("Ended conversation %s", session_id)
+
             # Send confirmation
             response = AgentMessage(
                 message_type="conversation_ended",
                 sender_agent=self.config.name,
                 recipient_agent=sender,
                 payload={"status": "completed", "session_id": session_id},
-                session_id=session_id
+                session_id=session_id,
             )
-            
+
             await self.send_message_to_agent(sender, response)
-            
+
         except Exception as e:
-            logger.error(f"Error ending conversation: {str(e)}")
-    
-    async def _archive_conversation(self, conversation: ActiveConversation) -> None:
+            logger.error("Error ending conversation: %s", e)
+
+    async def _archive_conversation(
+        self, conversation: ActiveConversation, ended_at: Optional[datetime] = None
+    ) -> None:
         """Archive completed conversation data."""
         try:
             # TODO: Save conversation data to database
-            logger.info(f"Archiving conversation {conversation.session_id}")
-            
+            logger.info("Archiving conversation %s", conversation.session_id)
+
             # Calculate conversation metrics
             history = conversation.context_data.get("conversation_history", [])
             metrics = {
-                "duration": (datetime.utcnow() - conversation.last_activity).total_seconds(),
+                "duration": (
+                    (ended_at or datetime.utcnow()) - conversation.started_at
+                ).total_seconds(),
                 "message_count": len(history),
                 "participating_agents": list(conversation.participating_agents),
                 "intervention_level": conversation.intervention_level,
-                "conversation_type": conversation.conversation_type
+                "conversation_type": conversation.conversation_type,
             }
-            
-            logger.info(f"Conversation metrics: {metrics}")
-            
+
+            logger.info("Conversation metrics: %r", metrics)
+
         except Exception as e:
-            logger.error(f"Error archiving conversation: {str(e)}")
+            logger.error("Error archiving conversation: %s", e)
+
 
 # Factory function to create conversation coordinator agent
-def create_conversation_coordinator_agent(port: Optional[int] = None) -> ConversationCoordinatorAgent:
+def create_conversation_coordinator_agent(
+    port: Optional[int] = None,
+) -> ConversationCoordinatorAgent:
     """
     Create a conversation coordinator agent.
-    
+
     Args:
         port: Optional port number
-        
+
     Returns:
         Configured conversation coordinator agent
     """
@@ -586,7 +1028,7 @@ def create_conversation_coordinator_agent(port: Optional[int] = None) -> Convers
         port=port or 8002,
         seed="conversation_coordinator_seed",
         crisis_detection_enabled=True,
-        mental_health_focus=True
+        mental_health_focus=True,
     )
-    
-    return ConversationCoordinatorAgent(config) 
\ No newline at end of file
+
+    return ConversationCoordinatorAgent(config)
@@ -7,15 +7,19 @@ coordination with other mental wellness agents.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from bisect import bisect_left
+from collections import Counter, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from services.agent_service import (
-    MentalWellnessAgent, 
-    AgentConfiguration, 
-    AgentType, 
-    AgentMessage
+    AgentConfiguration,
+    AgentMessage,
+    AgentType,
+    MentalWellnessAgent,
 )
 
 try:
@@ -23,11 +27,66 @@ try:
 except ImportError:
     Context = None
 
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    # Fallback to pure-Python statistics when NumPy is not available
+    np = None
+    HAS_NUMPY = False
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Readings kept in memory per user
+MOOD_HISTORY_LIMIT = 100
+
+_READING_TIMESTAMP = attrgetter("timestamp")
+
+# Days of readings covered by per-entry analysis
+ANALYSIS_WINDOW_DAYS = 7
+
+# Days of readings scanned for weekly and trigger patterns
+PATTERN_WINDOW_DAYS = 30
+
+# Outbound messages waiting to be sent, and how many are sent together
+OUTBOX_QUEUE_MAX = 1024
+OUTBOX_BATCH_SIZE = 32
+
+# Indexed by datetime.weekday()
+_WEEKDAY_LC = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+_LOW_MOOD_PATTERNS = tuple(f"low_mood_on_{day}" for day in _WEEKDAY_LC)
+
+# Fixed recommendation groups added by _generate_mood_recommendations
+_LOW_MOOD_RECS = (
+    "gentle_self_care_activities",
+    "connect_with_support_system",
+    "practice_gratitude_exercise",
+)
+_HIGH_STRESS_RECS = (
+    "deep_breathing_exercise",
+    "progressive_muscle_relaxation",
+    "mindfulness_meditation",
+)
+_LOW_ENERGY_RECS = (
+    "light_physical_activity",
+    "healthy_nutrition_check",
+    "sleep_hygiene_review",
+)
+
+
+@dataclass(slots=True)
 class MoodReading:
-    """Structured mood reading data."""
+    """Structured mood reading data (slotted; up to MOOD_HISTORY_LIMIT are kept per user)."""
+
     user_id: str
     mood_score: int  # 1-10 scale
     emotions: List[str]
@@ -37,76 +96,269 @@ class MoodReading:
     triggers: Optional[List[str]] = None
     notes: Optional[str] = None
     timestamp: Optional[datetime] = None
-    
+
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.utcnow()
 
+
+@dataclass
+class MoodWindow:
+    """
+    Rolling aggregates over a user's readings from the last ``days`` days.
+
+    Readings are pushed in arrival (timestamp) order; sums are updated as
+    readings enter and leave, so the mean never rescans the window.
+    """
+
+    days: int = ANALYSIS_WINDOW_DAYS
+    readings: Deque[MoodReading] = field(default_factory=deque)
+    total: int = 0
+
+    def push(self, reading: MoodReading) -> None:
+        """Add a reading, dropping the oldest beyond the in-memory history limit."""
+        if len(self.readings) >= MOOD_HISTORY_LIMIT:
+            self._pop_oldest()
+        self.readings.append(reading)
+        self.total += reading.mood_score
+
+    def expire(self, now: Optional[datetime] = None) -> None:
+        """Drop readings older than the window."""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.days)
+        while self.readings and self.readings[0].timestamp < cutoff:
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        score = self.readings.popleft().mood_score
+        self.total -= score
+
+    @property
+    def count(self) -> int:
+        return len(self.readings)
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.readings)
+
+    def latest_scores(self, n: int) -> List[int]:
+        """Return the scores of the ``n`` most recent readings, oldest first."""
+        return [reading.mood_score for reading in islice(reversed(self.readings), n)][
+            ::-1
+        ]
+
+
+@dataclass
+class PatternWindow(MoodWindow):
+    """MoodWindow that also tallies scores per weekday and occurrences per trigger."""
+
+    days: int = PATTERN_WINDOW_DAYS
+    weekday_totals: List[int] = field(default_factory=lambda: [0] * 7)
+    weekday_counts: List[int] = field(default_factory=lambda: [0] * 7)
+    trigger_counts: Counter = field(default_factory=Counter)
+
+    def push(self, reading: MoodReading) -> None:
+        super().push(reading)
+        weekday = reading.timestamp.weekday()
+        self.weekday_totals[weekday] += reading.mood_score
+        self.weekday_counts[weekday] += 1
+        if reading.triggers:
+            self.trigger_counts.update(reading.triggers)
+
+    def _pop_oldest(self) -> None:
+        reading = self.readings[0]
+        weekday = reading.timestamp.weekday()
+        self.weekday_totals[weekday] -= reading.mood_score
+        self.weekday_counts[weekday] -= 1
+        if reading.triggers:
+            self.trigger_counts.subtract(reading.triggers)
+            for trigger in reading.triggers:
+                if self.trigger_counts[trigger] <= 0:
+                    del self.trigger_counts[trigger]
+        super()._pop_oldest()
+
+    def low_mood_weekdays(self) -> List[int]:
+        """Weekdays with at least three readings averaging below 4, in first-seen order."""
+        low = {
+            weekday
+            for weekday, count in enumerate(self.weekday_counts)
+            if count >= 3 and self.weekday_totals[weekday] < 4 * count
+        }
+        return self._first_seen(low, lambda reading: (reading.timestamp.weekday(),))
+
+    def frequent_triggers(self, min_count: int = 3) -> List[str]:
+        """Triggers seen at least ``min_count`` times, in first-seen order."""
+        frequent = {
+            trigger
+            for trigger, count in self.trigger_counts.items()
+            if count >= min_count
+        }
+        return self._first_seen(frequent, lambda reading: reading.triggers or ())
+
+    def _first_seen(self, wanted: set, keys_of) -> list:
+        """Order ``wanted`` by first appearance, stopping once all are found."""
+        if len(wanted) < 2:
+            return list(wanted)
+
+        ordered = []
+        for reading in self.readings:
+            for key in keys_of(reading):
+                if key in wanted:
+                    wanted.discard(key)
+                    ordered.append(key)
+            if not wanted:
+                break
+        return ordered
+
+
 class MoodTrackerAgent(MentalWellnessAgent):
     """
     Specialized agent for mood tracking and analysis.
-    
+
     Responsibilities:
     - Collect and analyze mood data
     - Detect mood patterns and trends
     - Coordinate with other agents based on mood insights
     - Provide mood-based recommendations
     """
-    
+
+    # Message type -> handler method, bound once at registration
+    _HANDLERS: Tuple[Tuple[str, str], ...] = (
+        ("mood_entry", "_handle_mood_entry"),
+        ("mood_analysis_request", "_handle_mood_analysis_request"),
+        ("mood_pattern_request", "_handle_mood_pattern_request"),
+        ("mood_recommendation_request", "_handle_mood_recommendation_request"),
+    )
+
     def __init__(self, config: AgentConfiguration):
         """Initialize the mood tracker agent."""
         super().__init__(config)
-        
+
         # Mood tracking specific data
-        self.mood_history: Dict[str, List[MoodReading]] = {}
+        self.mood_history: Dict[str, Deque[MoodReading]] = {}
+        # Running aggregates over each user's analysis window
+        self.mood_aggregates: Dict[str, MoodWindow] = {}
+        self.pattern_windows: Dict[str, PatternWindow] = {}
+        # Pattern results, reused until a reading is stored or one ages out of the window
+        self._history_version: Dict[str, int] = {}
+        self._patterns_cache: Dict[str, Tuple[Tuple[int, int], Tuple[str, ...]]] = {}
         self.mood_patterns: Dict[str, Dict] = {}
+        # Outbound messages, sent concurrently in batches by a background worker
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_QUEUE_MAX)
+        self._outbox_worker: Optional[asyncio.Task] = None
         self.alert_thresholds = {
             "low_mood_threshold": 3,
             "consecutive_low_days": 3,
             "stress_threshold": 7,
-            "energy_threshold": 2
+            "energy_threshold": 2,
         }
-        
+        # Thresholds are read on every analysis; keep them as plain attributes
+        self._low_mood_thr = int(self.alert_thresholds["low_mood_threshold"])
+        self._consecutive_low_days = int(self.alert_thresholds["consecutive_low_days"])
+        self._stress_thr = int(self.alert_thresholds["stress_threshold"])
+        self._energy_thr = int(self.alert_thresholds["energy_threshold"])
+
         # Register mood-specific message handlers
         self._register_mood_handlers()
-    
+
     def _register_mood_handlers(self) -> None:
         """Register message handlers specific to mood tracking."""
-        self.register_message_handler("mood_entry", self._handle_mood_entry)
-        self.register_message_handler("mood_analysis_request", self._handle_mood_analysis_request)
-        self.register_message_handler("mood_pattern_request", self._handle_mood_pattern_request)
-        self.register_message_handler("mood_recommendation_request", self._handle_mood_recommendation_request)
-    
+        self.message_handlers.update(
+            {
+                message_type: getattr(self, method_name)
+                for message_type, method_name in self._HANDLERS
+            }
+        )
+        logger.info("Registered %d mood tracker handlers", len(self._HANDLERS))
+
     async def _on_startup(self, ctx: Context) -> None:
         """Initialize mood tracker agent."""
         logger.info("Mood Tracker Agent starting up...")
-        
+
         # Load historical mood data if available
         await self._load_mood_history()
-        
+
+        if self._outbox_worker is None:
+            self._outbox_worker = asyncio.create_task(self._run_outbox_worker())
+
         # Start periodic mood analysis
         if ctx:
             ctx.logger.info("Mood tracking services initialized")
-    
+
+    async def _on_shutdown(self, ctx: Context) -> None:
+        """Send any messages still queued in the outbox."""
+        if self._outbox_worker is not None:
+            self._outbox_worker.cancel()
+            try:
+                await self._outbox_worker
+            except asyncio.CancelledError:
+                pass
+            self._outbox_worker = None
+
+        while not self._outbox.empty():
+            await self._send_outbox_batch(
+                self._take_outbox_batch(self._outbox.get_nowait())
+            )
+
+    async def _queue_message(
+        self, recipient_address: str, message: AgentMessage
+    ) -> None:
+        """Hand a message to the outbox worker; send inline if it is stopped or backed up."""
+        if self._outbox_worker is not None:
+            try:
+                self._outbox.put_nowait((recipient_address, message))
+                return
+            except asyncio.QueueFull:
+                logger.warning("Outbox full, sending %s inline", message.message_type)
+        await self.send_message_to_agent(recipient_address, message)
+
+    async def _run_outbox_worker(self) -> None:
+        """Send queued messages, gathering whatever has accumulated up to OUTBOX_BATCH_SIZE."""
+        while True:
+            batch = self._take_outbox_batch(await self._outbox.get())
+            try:
+                await self._send_outbox_batch(batch)
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+
+    def _take_outbox_batch(
+        self, first: Tuple[str, AgentMessage]
+    ) -> List[Tuple[str, AgentMessage]]:
+        batch = [first]
+        while len(batch) < OUTBOX_BATCH_SIZE and not self._outbox.empty():
+            batch.append(self._outbox.get_nowait())
+        return batch
+
+    async def _send_outbox_batch(self, batch: List[Tuple[str, AgentMessage]]) -> None:
+        await asyncio.gather(
+            *(
+                self.send_message_to_agent(recipient, message)
+                for recipient, message in batch
+            ),
+            return_exceptions=True,
+        )
+
     async def _load_mood_history(self) -> None:
         """Load historical mood data from database."""
         try:
             # This would integrate with the database to load existing mood entries
             # For now, we'll initialize with empty history
             logger.info("Loading mood history from database...")
-            
+
             # TODO: Integrate with MoodEntry model from database
             # mood_entries = MoodEntry.query.all()
             # for entry in mood_entries:
             #     self._add_mood_reading_to_history(entry)
-            
+
         except Exception as e:
             logger.error(f"Error loading mood history: {str(e)}")
-    
-    async def _handle_mood_entry(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+
+    async def _handle_mood_entry(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """
         Handle new mood entry from user or conversation agent.
-        
+
         Args:
             ctx: Agent context
             sender: Sender address
@@ -115,11 +367,14 @@ class MoodTrackerAgent(MentalWellnessAgent):
         try:
             mood_data = msg.payload.get("mood_data", {})
             user_id = msg.user_id
-            
+
             if not user_id or not mood_data:
                 logger.warning("Invalid mood entry data received")
                 return
-            
+
+            # One clock read serves the whole entry
+            now = datetime.utcnow()
+
             # Create mood reading
             mood_reading = MoodReading(
                 user_id=user_id,
@@ -129,19 +384,20 @@ class MoodTrackerAgent(MentalWellnessAgent):
                 stress_level=mood_data.get("stress_level"),
                 sleep_hours=mood_data.get("sleep_hours"),
                 triggers=mood_data.get("triggers", []),
-                notes=mood_data.get("notes")
+                notes=mood_data.get("notes"),
+                timestamp=now,
             )
-            
+
             # Store mood reading
-            await self._store_mood_reading(mood_reading)
-            
+            await self._store_mood_reading(mood_reading, now=now)
+
             # Analyze for patterns and alerts
-            analysis = await self._analyze_mood_reading(mood_reading)
-            
+            analysis = await self._analyze_mood_reading(mood_reading, now=now)
+
             # Send analysis to conversation coordinator if needed
             if analysis.get("needs_intervention"):
-                await self._send_mood_alert(user_id, mood_reading, analysis)
-            
+                await self._send_mood_alert(user_id, mood_reading, analysis, now=now)
+
             # Send confirmation back
             response = AgentMessage(
                 message_type="mood_entry_processed",
@@ -151,32 +407,43 @@ class MoodTrackerAgent(MentalWellnessAgent):
                     "status": "success",
                     "mood_score": mood_reading.mood_score,
                     "analysis": analysis,
-                    "recommendations": analysis.get("recommendations", [])
+                    "recommendations": analysis.get("recommendations", []),
                 },
                 user_id=user_id,
-                session_id=msg.session_id
+                session_id=msg.session_id,
             )
-            
-            await self.send_message_to_agent(sender, response)
-            
+
+            await self._queue_message(sender, response)
+
         except Exception as e:
             logger.error(f"Error handling mood entry: {str(e)}")
-    
-    async def _store_mood_reading(self, mood_reading: MoodReading) -> None:
+
+    async def _store_mood_reading(
+        self, mood_reading: MoodReading, now: Optional[datetime] = None
+    ) -> None:
         """Store mood reading in memory and database."""
         try:
             user_id = mood_reading.user_id
-            
-            # Store in memory
-            if user_id not in self.mood_history:
-                self.mood_history[user_id] = []
-            
-            self.mood_history[user_id].append(mood_reading)
-            
-            # Keep only last 100 readings in memory
-            if len(self.mood_history[user_id]) > 100:
-                self.mood_history[user_id] = self.mood_history[user_id][-100:]
-            
+
+            # Store in memory; the ring buffer keeps only the most recent readings
+            history = self.mood_history.get(user_id)
+            if history is None:
+                history = self.mood_history[user_id] = deque(maxlen=MOOD_HISTORY_LIMIT)
+
+            history.append(mood_reading)
+            self._history_version[user_id] = self._history_version.get(user_id, 0) + 1
+
+            window = self.mood_aggregates.get(user_id)
+            if window is None:
+                window = self.mood_aggregates[user_id] = MoodWindow()
+            window.push(mood_reading)
+            window.expire(now)
+
+            pattern_window = self.pattern_windows.get(user_id)
+            if pattern_window is None:
+                pattern_window = self.pattern_windows[user_id] = PatternWindow()
+            pattern_window.push(mood_reading)
+
             # TODO: Store in database
             # mood_entry = MoodEntry(
             #     user_id=mood_reading.user_id,
@@ -186,19 +453,24 @@ class MoodTrackerAgent(MentalWellnessAgent):
             # )
             # db.session.add(mood_entry)
             # db.session.commit()
-            
-            logger.info(f"Stored mood reading for user {user_id}: {mood_reading.mood_score}")
-            
+
+            logger.info(
+                f"Stored mood reading for user {user_id}: {mood_reading.mood_score}"
+            )
+
         except Exception as e:
             logger.error(f"Error storing mood reading: {str(e)}")
-    
-    async def _analyze_mood_reading(self, mood_reading: MoodReading) -> Dict[str, Any]:
+
+    async def _analyze_mood_reading(
+        self, mood_reading: MoodReading, now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Analyze mood reading for patterns and alerts.
-        
+
         Args:
             mood_reading: The mood reading to analyze
-            
+            now: Current time, read from the clock when not given
+
         Returns:
             Analysis results with recommendations and alerts
         """
@@ -209,148 +481,189 @@ class MoodTrackerAgent(MentalWellnessAgent):
                 "needs_intervention": False,
                 "recommendations": [],
                 "alerts": [],
-                "pattern_insights": []
+                "pattern_insights": [],
             }
-            
-            # Get recent mood history
-            recent_moods = self._get_recent_moods(user_id, days=7)
-            
-            if len(recent_moods) < 2:
+
+            # Get recent mood aggregates
+            window = self.mood_aggregates.get(user_id)
+            if window is not None:
+                window.expire(now)
+
+            if window is None or window.count < 2:
                 return analysis
-            
+
             # Analyze mood trend
-            mood_scores = [reading.mood_score for reading in recent_moods]
             current_score = mood_reading.mood_score
-            avg_score = sum(mood_scores) / len(mood_scores)
-            
+            avg_score = window.mean
+
             # Determine trend
             if current_score < avg_score - 1:
                 analysis["mood_trend"] = "declining"
             elif current_score > avg_score + 1:
                 analysis["mood_trend"] = "improving"
-            
+
             # Check for intervention needs
-            low_mood_days = sum(1 for score in mood_scores[-3:] if score <= self.alert_thresholds["low_mood_threshold"])
-            
-            if low_mood_days >= self.alert_thresholds["consecutive_low_days"]:
+            low_mood_thr = self._low_mood_thr
+            low_mood_days = sum(
+                1 for score in window.latest_scores(3) if score <= low_mood_thr
+            )
+
+            if low_mood_days >= self._consecutive_low_days:
                 analysis["needs_intervention"] = True
                 analysis["alerts"].append("consecutive_low_mood")
-            
+
             if current_score <= 2:
                 analysis["needs_intervention"] = True
                 analysis["alerts"].append("severe_low_mood")
-            
+
             # Check stress and energy levels
-            if mood_reading.stress_level and mood_reading.stress_level >= self.alert_thresholds["stress_threshold"]:
-                analysis["alerts"].append("high_stress")
-                analysis["recommendations"].append("stress_management_techniques")
-            
-            if mood_reading.energy_level and mood_reading.energy_level <= self.alert_thresholds["energy_threshold"]:
-                analysis["alerts"].append("low_energy")
-                analysis["recommendations"].append("energy_boosting_activities")
-            
+            level_alerts, level_recommendations = self._level_alerts(mood_reading)
+            analysis["alerts"].extend(level_alerts)
+            analysis["recommendations"].extend(level_recommendations)
+
             # Pattern analysis
-            patterns = self._detect_mood_patterns(user_id)
+            patterns = self._detect_mood_patterns(user_id, now)
             if patterns:
                 analysis["pattern_insights"] = patterns
-            
+
             # Generate recommendations based on analysis
-            recommendations = self._generate_mood_recommendations(mood_reading, analysis)
+            recommendations = self._generate_mood_recommendations(
+                mood_reading, analysis
+            )
             analysis["recommendations"].extend(recommendations)
-            
+
             return analysis
-            
+
         except Exception as e:
             logger.error(f"Error analyzing mood reading: {str(e)}")
             return {"error": str(e)}
-    
-    def _get_recent_moods(self, user_id: str, days: int = 7) -> List[MoodReading]:
-        """Get recent mood readings for a user."""
-        if user_id not in self.mood_history:
+
+    def _level_alerts(self, mood_reading: MoodReading) -> Tuple[List[str], List[str]]:
+        """Return stress/energy alerts and their recommendations for a reading."""
+        alerts = []
+        recommendations = []
+
+        if mood_reading.stress_level and mood_reading.stress_level >= self._stress_thr:
+            alerts.append("high_stress")
+            recommendations.append("stress_management_techniques")
+
+        if mood_reading.energy_level and mood_reading.energy_level <= self._energy_thr:
+            alerts.append("low_energy")
+            recommendations.append("energy_boosting_activities")
+
+        return alerts, recommendations
+
+    def _recommendations_for(
+        self, mood_reading: MoodReading, now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Produce the recommendations of ``_analyze_mood_reading`` without its trend
+        and intervention checks.
+        """
+        window = self.mood_aggregates.get(mood_reading.user_id)
+        if window is not None:
+            window.expire(now)
+
+        if window is None or window.count < 2:
             return []
-        
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        recent_moods = [
-            reading for reading in self.mood_history[user_id]
-            if reading.timestamp >= cutoff_date
-        ]
-        
-        return sorted(recent_moods, key=lambda x: x.timestamp)
-    
-    def _detect_mood_patterns(self, user_id: str) -> List[str]:
+
+        alerts, recommendations = self._level_alerts(mood_reading)
+        recommendations.extend(
+            self._generate_mood_recommendations(
+                mood_reading,
+                {
+                    "alerts": alerts,
+                    "pattern_insights": self._detect_mood_patterns(
+                        mood_reading.user_id, now
+                    ),
+                },
+            )
+        )
+        return recommendations
+
+    def _get_recent_moods(
+        self, user_id: str, days: int = 7, now: Optional[datetime] = None
+    ) -> List[MoodReading]:
+        """Get recent mood readings for a user, oldest first."""
+        history = self.mood_history.get(user_id)
+        if not history:
+            return []
+
+        return list(islice(history, self._recent_start(history, days, now), None))
+
+    def _recent_start(
+        self, history: Deque[MoodReading], days: int, now: Optional[datetime] = None
+    ) -> int:
+        """Index of the first reading in the last ``days`` days."""
+        # History is appended in timestamp order, so the cutoff can be bisected
+        cutoff_date = (now or datetime.utcnow()) - timedelta(days=days)
+        return bisect_left(history, cutoff_date, key=_READING_TIMESTAMP)
+
+    def _detect_mood_patterns(
+        self, user_id: str, now: Optional[datetime] = None
+    ) -> List[str]:
         """Detect patterns in user's mood data."""
-        patterns = []
-        recent_moods = self._get_recent_moods(user_id, days=30)
-        
-        if len(recent_moods) < 5:
-            return patterns
-        
-        # Weekly pattern detection
-        weekday_moods = {}
-        for reading in recent_moods:
-            weekday = reading.timestamp.weekday()
-            if weekday not in weekday_moods:
-                weekday_moods[weekday] = []
-            weekday_moods[weekday].append(reading.mood_score)
-        
-        # Find consistently low days
-        for weekday, scores in weekday_moods.items():
-            if len(scores) >= 3 and sum(scores) / len(scores) < 4:
-                day_name = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"][weekday]
-                patterns.append(f"low_mood_on_{day_name.lower()}")
-        
-        # Trigger pattern analysis
-        trigger_counts = {}
-        for reading in recent_moods:
-            if reading.triggers:
-                for trigger in reading.triggers:
-                    trigger_counts[trigger] = trigger_counts.get(trigger, 0) + 1
-        
-        # Find frequent triggers
-        for trigger, count in trigger_counts.items():
-            if count >= 3:
-                patterns.append(f"frequent_trigger_{trigger}")
-        
+        window = self.pattern_windows.get(user_id)
+        if window is None:
+            return []
+
+        window.expire(now)
+        if window.count < 5:
+            return []
+
+        # Within one history version the window only shrinks, so its size identifies it
+        key = (self._history_version.get(user_id, 0), window.count)
+        cached = self._patterns_cache.get(user_id)
+        if cached is not None and cached[0] == key:
+            return list(cached[1])
+
+        # Consistently low days, then frequent triggers
+        patterns = [
+            _LOW_MOOD_PATTERNS[weekday] for weekday in window.low_mood_weekdays()
+        ]
+        patterns.extend(
+            f"frequent_trigger_{trigger}" for trigger in window.frequent_triggers()
+        )
+
+        self._patterns_cache[user_id] = (key, tuple(patterns))
         return patterns
-    
-    def _generate_mood_recommendations(self, mood_reading: MoodReading, analysis: Dict) -> List[str]:
+
+    def _generate_mood_recommendations(
+        self, mood_reading: MoodReading, analysis: Dict
+    ) -> List[str]:
         """Generate personalized recommendations based on mood analysis."""
-        recommendations = []
-        
+        # A set accumulator removes duplicates as they are added
+        recommendations = set()
+        alerts = analysis.get("alerts", ())
+
         # Low mood recommendations
         if mood_reading.mood_score <= 4:
-            recommendations.extend([
-                "gentle_self_care_activities",
-                "connect_with_support_system",
-                "practice_gratitude_exercise"
-            ])
-        
+            recommendations.update(_LOW_MOOD_RECS)
+
         # High stress recommendations
-        if "high_stress" in analysis.get("alerts", []):
-            recommendations.extend([
-                "deep_breathing_exercise",
-                "progressive_muscle_relaxation",
-                "mindfulness_meditation"
-            ])
-        
+        if "high_stress" in alerts:
+            recommendations.update(_HIGH_STRESS_RECS)
+
         # Low energy recommendations
-        if "low_energy" in analysis.get("alerts", []):
-            recommendations.extend([
-                "light_physical_activity",
-                "healthy_nutrition_check",
-                "sleep_hygiene_review"
-            ])
-        
+        if "low_energy" in alerts:
+            recommendations.update(_LOW_ENERGY_RECS)
+
         # Pattern-based recommendations
-        for pattern in analysis.get("pattern_insights", []):
+        for pattern in analysis.get("pattern_insights", ()):
             if "low_mood_on" in pattern:
-                recommendations.append("weekly_planning_support")
+                recommendations.add("weekly_planning_support")
             elif "frequent_trigger" in pattern:
-                recommendations.append("trigger_management_strategies")
-        
-        return list(set(recommendations))  # Remove duplicates
-    
-    async def _send_mood_alert(self, user_id: str, mood_reading: MoodReading, analysis: Dict) -> None:
+                recommendations.add("trigger_management_strategies")
+
+        return list(recommendations)
+
+    async def _send_mood_alert(
+        self,
+        user_id: str,
+        mood_reading: MoodReading,
+        analysis: Dict,
+        now: Optional[datetime] = None,
+    ) -> None:
         """Send mood alert to conversation coordinator."""
         try:
             alert_message = AgentMessage(
@@ -364,122 +677,150 @@ class MoodTrackerAgent(MentalWellnessAgent):
                     "alerts": analysis.get("alerts", []),
                     "recommendations": analysis.get("recommendations", []),
                     "mood_trend": analysis.get("mood_trend"),
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": (now or datetime.utcnow()).isoformat(),
                 },
                 priority="high",
-                requires_response=True
+                requires_response=True,
             )
-            
-            await self.send_message_to_agent("conversation_coordinator", alert_message)
+
+            await self._queue_message("conversation_coordinator", alert_message)
             logger.info(f"Sent mood alert for user {user_id}")
-            
+
         except Exception as e:
             logger.error(f"Error sending mood alert: {str(e)}")
-    
-    async def _handle_mood_analysis_request(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+
+    async def _handle_mood_analysis_request(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """Handle request for mood analysis."""
         try:
             user_id = msg.user_id
             days = msg.payload.get("days", 7)
-            
-            recent_moods = self._get_recent_moods(user_id, days)
-            
+            now = datetime.utcnow()
+
+            recent_moods = self._get_recent_moods(user_id, days, now)
+
             if not recent_moods:
                 response_payload = {"error": "No mood data available"}
             else:
                 # Calculate statistics
                 mood_scores = [reading.mood_score for reading in recent_moods]
+                patterns = self._detect_mood_patterns(user_id, now)
                 analysis = {
-                    "average_mood": sum(mood_scores) / len(mood_scores),
-                    "highest_mood": max(mood_scores),
-                    "lowest_mood": min(mood_scores),
-                    "mood_variance": self._calculate_variance(mood_scores),
+                    **self._calculate_mood_statistics(mood_scores),
                     "total_entries": len(recent_moods),
-                    "patterns": self._detect_mood_patterns(user_id),
-                    "recommendations": self._generate_mood_recommendations(recent_moods[-1], {
-                        "pattern_insights": self._detect_mood_patterns(user_id)
-                    })
+                    "patterns": patterns,
+                    "recommendations": self._generate_mood_recommendations(
+                        recent_moods[-1], {"pattern_insights": patterns}
+                    ),
                 }
                 response_payload = {"analysis": analysis}
-            
+
             response = AgentMessage(
                 message_type="mood_analysis_response",
                 sender_agent=self.config.name,
                 recipient_agent=sender,
                 payload=response_payload,
                 user_id=user_id,
-                session_id=msg.session_id
+                session_id=msg.session_id,
             )
-            
-            await self.send_message_to_agent(sender, response)
-            
+
+            await self._queue_message(sender, response)
+
         except Exception as e:
             logger.error(f"Error handling mood analysis request: {str(e)}")
-    
+
     def _calculate_variance(self, scores: List[int]) -> float:
         """Calculate variance of mood scores."""
         if len(scores) < 2:
             return 0.0
-        
+
+        if HAS_NUMPY:
+            return round(float(np.asarray(scores, dtype=np.float64).var()), 2)
+
         mean = sum(scores) / len(scores)
         variance = sum((score - mean) ** 2 for score in scores) / len(scores)
         return round(variance, 2)
-    
-    async def _handle_mood_pattern_request(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+
+    def _calculate_mood_statistics(self, scores: List[int]) -> Dict[str, Any]:
+        """Calculate average, range and variance of non-empty mood scores."""
+        if not HAS_NUMPY:
+            return {
+                "average_mood": sum(scores) / len(scores),
+                "highest_mood": max(scores),
+                "lowest_mood": min(scores),
+                "mood_variance": self._calculate_variance(scores),
+            }
+
+        # One array feeds every statistic
+        arr = np.asarray(scores, dtype=np.float64)
+        return {
+            "average_mood": float(arr.mean()),
+            "highest_mood": int(arr.max()),
+            "lowest_mood": int(arr.min()),
+            "mood_variance": round(float(arr.var()), 2) if arr.size >= 2 else 0.0,
+        }
+
+    async def _handle_mood_pattern_request(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """Handle request for mood patterns."""
         try:
             user_id = msg.user_id
             patterns = self._detect_mood_patterns(user_id)
-            
+
             response = AgentMessage(
                 message_type="mood_pattern_response",
                 sender_agent=self.config.name,
                 recipient_agent=sender,
                 payload={"patterns": patterns},
                 user_id=user_id,
-                session_id=msg.session_id
+                session_id=msg.session_id,
             )
-            
-            await self.send_message_to_agent(sender, response)
-            
+
+            await self._queue_message(sender, response)
+
         except Exception as e:
             logger.error(f"Error handling mood pattern request: {str(e)}")
-    
-    async def _handle_mood_recommendation_request(self, ctx: Context, sender: str, msg: AgentMessage) -> None:
+
+    async def _handle_mood_recommendation_request(
+        self, ctx: Context, sender: str, msg: AgentMessage
+    ) -> None:
         """Handle request for mood-based recommendations."""
         try:
             user_id = msg.user_id
-            recent_moods = self._get_recent_moods(user_id, days=1)
-            
-            if recent_moods:
-                latest_mood = recent_moods[-1]
-                analysis = await self._analyze_mood_reading(latest_mood)
-                recommendations = analysis.get("recommendations", [])
+            history = self.mood_history.get(user_id)
+
+            # Only the latest reading matters, and only if it is from the last day
+            now = datetime.utcnow()
+            if history and history[-1].timestamp >= now - timedelta(days=1):
+                recommendations = self._recommendations_for(history[-1], now)
             else:
                 recommendations = ["start_daily_mood_tracking"]
-            
+
             response = AgentMessage(
                 message_type="mood_recommendation_response",
                 sender_agent=self.config.name,
                 recipient_agent=sender,
                 payload={"recommendations": recommendations},
                 user_id=user_id,
-                session_id=msg.session_id
+                session_id=msg.session_id,
             )
-            
-            await self.send_message_to_agent(sender, response)
-            
+
+            await self._queue_message(sender, response)
+
         except Exception as e:
             logger.error(f"Error handling mood recommendation request: {str(e)}")
 
+
 # Factory function to create mood tracker agent
 def create_mood_tracker_agent(port: Optional[int] = None) -> MoodTrackerAgent:
     """
     Create a mood tracker agent.
-    
+
     Args:
         port: Optional port number
-        
+
     Returns:
         Configured mood tracker agent
     """
@@ -489,7 +830,7 @@ def create_mood_tracker_agent(port: Optional[int] = None) -> MoodTrackerAgent:
         port=port or 8001,
         seed="mood_tracker_seed",
         crisis_detection_enabled=True,
-        mental_health_focus=True
+        mental_health_focus=True,
     )
-    
-    return MoodTrackerAgent(config) 
\ No newline at end of file
+
+    return MoodTrackerAgent(config)
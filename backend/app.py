@@ -5,144 +5,269 @@ This is the main entry point for the Flask API server.
 It sets up Flask, middleware, routes, and starts the server.
 """
 
-import os
 import logging
+import os
 from datetime import datetime
+
+from dotenv import load_dotenv
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from werkzeug.middleware.proxy_fix import ProxyFix
-from dotenv import load_dotenv
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    # Fallback to Flask's stdlib json provider when orjson is not available
+    orjson = None
+    HAS_ORJSON = False
 
 # Load environment variables
 load_dotenv()
 
 # Import extensions from database module to avoid circular imports
-from database import db, migrate
+from database import db, migrate  # noqa: E402
+
+# Import route blueprints once per process rather than on every create_app() call
+try:
+    from routes.agent_routes import agent_bp
+    from routes.auth_routes import auth_bp
+    from routes.conversation_routes import conversation_bp
+    from routes.crisis_routes import crisis_bp
+    from routes.journal_routes import journal_bp
+    from routes.mindfulness_routes import mindfulness_bp
+    from routes.mood_routes import mood_bp
+
+    BLUEPRINTS = (
+        (auth_bp, "/api/auth"),
+        (mood_bp, "/api/mood"),
+        (conversation_bp, "/api/conversations"),
+        (agent_bp, "/api/agents"),
+        (crisis_bp, "/api/crisis"),
+        (journal_bp, "/api/journal"),
+        (mindfulness_bp, "/api/mindfulness"),
+    )
+    ROUTES_IMPORT_ERROR = None
+except ImportError as e:
+    # Routes not ready yet; create_app() logs this and serves the core endpoints only
+    BLUEPRINTS = ()
+    ROUTES_IMPORT_ERROR = e
 
 jwt = JWTManager()
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson.
+
+    Output matches the default provider (sorted keys, HTTP-date datetimes via
+    ``default``); request bodies are still parsed by the stdlib.
+    """
+
+    def _options(self, indent=False):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=self.default, option=self._options(kwargs.get("indent"))
+        ).decode()
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            orjson.dumps(
+                obj,
+                default=self.default,
+                option=self._options(indent) | orjson.OPT_APPEND_NEWLINE,
+            ),
+            mimetype=self.mimetype,
+        )
+
+
 def create_app():
     """Application factory pattern."""
     app = Flask(__name__)
-    
+    if HAS_ORJSON:
+        app.json = OrjsonProvider(app)
+
     # Configuration - Using SQLite instead of PostgreSQL
-    app.config['SECRET_KEY'] = os.getenv('JWT_SECRET', 'dev-secret-key')
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///wellness_coach.db'  # Force SQLite
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET', 'dev-jwt-secret')
-    
+    app.config["SECRET_KEY"] = os.getenv("JWT_SECRET", "dev-secret-key")
+    app.config[
+        "SQLALCHEMY_DATABASE_URI"
+    ] = "sqlite:///wellness_coach.db"  # Force SQLite
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET", "dev-jwt-secret")
+
     # Initialize extensions with app
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
-    
+
     # Security middleware
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
-    
+
     # CORS configuration
-    cors_origins = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
+    cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
     CORS(app, origins=cors_origins, supports_credentials=True)
-    
+
     # Logging configuration
     logging.basicConfig(
-        level=logging.INFO if os.getenv('NODE_ENV') != 'development' else logging.DEBUG,
-        format='%(asctime)s %(levelname)s %(name)s %(message)s'
+        level=logging.INFO if os.getenv("NODE_ENV") != "development" else logging.DEBUG,
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
     )
     logger = logging.getLogger(__name__)
-    
+
     # Health check endpoint
-    @app.route('/health', methods=['GET'])
+    @app.route("/health", methods=["GET"])
     def health_check():
         """Health check endpoint for monitoring."""
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.utcnow().isoformat(),
-            'environment': os.getenv('NODE_ENV', 'development'),
-            'version': '1.0.0',
-            'service': 'mental-wellness-coach-flask-api',
-            'database': 'sqlite'
-        }), 200
-    
+        return (
+            jsonify(
+                {
+                    "status": "healthy",
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "environment": os.getenv("NODE_ENV", "development"),
+                    "version": "1.0.0",
+                    "service": "mental-wellness-coach-flask-api",
+                    "database": "sqlite",
+                }
+            ),
+            200,
+        )
+
     # Basic route
-    @app.route('/', methods=['GET'])
+    @app.route("/", methods=["GET"])
     def root():
         """Root endpoint with API information."""
-        return jsonify({
-            'message': 'Mental Wellness Coach Flask API',
-            'version': '1.0.0',
-            'documentation': '/api/docs',
-            'health': '/health',
-            'framework': 'Flask',
-            'language': 'Python',
-            'database': 'SQLite'
-        }), 200
-    
+        return (
+            jsonify(
+                {
+                    "message": "Mental Wellness Coach Flask API",
+                    "version": "1.0.0",
+                    "documentation": "/api/docs",
+                    "health": "/health",
+                    "framework": "Flask",
+                    "language": "Python",
+                    "database": "SQLite",
+                }
+            ),
+            200,
+        )
+
     # 404 handler
     @app.errorhandler(404)
     def not_found(error):
         """Handle 404 errors."""
-        return jsonify({
-            'error': 'Route not found',
-            'message': f'The route {request.url} does not exist'
-        }), 404
-    
+        return (
+            jsonify(
+                {
+                    "error": "Route not found",
+                    "message": f"The route {request.url} does not exist",
+                }
+            ),
+            404,
+        )
+
     # 500 handler
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors."""
-        logger.error(f'Internal server error: {error}')
-        return jsonify({
-            'error': 'Internal server error',
-            'message': 'Something went wrong' if os.getenv('NODE_ENV') == 'production' else str(error)
-        }), 500
-    
+        logger.error(f"Internal server error: {error}")
+        return (
+            jsonify(
+                {
+                    "error": "Internal server error",
+                    "message": "Something went wrong"
+                    if os.getenv("NODE_ENV") == "production"
+                    else str(error),
+                }
+            ),
+            500,
+        )
+
     # Register routes when they're ready
     with app.app_context():
         try:
             # Import models to ensure they're registered with SQLAlchemy
             # This import happens inside app context to avoid circular imports
             import models
-            
+
             # Create SQLite database tables
             models.init_database()
             logger.info("✅ SQLite database tables created successfully")
         except Exception as e:
             logger.warning(f"Database initialization error: {e}")
-            
+
         # Register blueprints when available
-        try:
-            from routes.auth_routes import auth_bp
-            from routes.mood_routes import mood_bp
-            from routes.conversation_routes import conversation_bp
-            from routes.agent_routes import agent_bp
-            from routes.crisis_routes import crisis_bp
-            from routes.journal_routes import journal_bp
-            from routes.mindfulness_routes import mindfulness_bp
-            app.register_blueprint(auth_bp, url_prefix='/api/auth')
-            app.register_blueprint(mood_bp, url_prefix='/api/mood')
-            app.register_blueprint(conversation_bp, url_prefix='/api/conversations')
-            app.register_blueprint(agent_bp, url_prefix='/api/agents')
-            app.register_blueprint(crisis_bp, url_prefix='/api/crisis')
-            app.register_blueprint(journal_bp, url_prefix='/api/journal')
-            app.register_blueprint(mindfulness_bp, url_prefix='/api/mindfulness')
+        if ROUTES_IMPORT_ERROR is None:
+            for blueprint, url_prefix in BLUEPRINTS:
+                app.register_blueprint(blueprint, url_prefix=url_prefix)
             logger.info("✅ All routes registered successfully")
-        except ImportError as e:
-            logger.warning(f"Some routes not available: {e}")
-    
+        else:
+            logger.warning(f"Some routes not available: {ROUTES_IMPORT_ERROR}")
+
     return app
 
+
+def run_gunicorn(app, port):
+    """
+    Serve the app with gunicorn threaded workers.
+
+    Defaults to a single process because sessions and conversations in the
+    mock stores are process-local; set WEB_CONCURRENCY to fork more workers.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    def post_fork(server, worker):
+        # Forked workers must not reuse the parent's pooled database connections
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+    class StandaloneApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"0.0.0.0:{port}")
+            self.cfg.set("workers", int(os.getenv("WEB_CONCURRENCY", 1)))
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("threads", int(os.getenv("GUNICORN_THREADS", 4)))
+            self.cfg.set("post_fork", post_fork)
+
+        def load(self):
+            return app
+
+    StandaloneApplication().run()
+
+
 # Create app instance for direct running
 app = create_app()
 
-if __name__ == '__main__':
-    port = int(os.getenv('PORT', 5000))
-    debug = os.getenv('NODE_ENV', 'development') == 'development'
-    
+if __name__ == "__main__":
+    port = int(os.getenv("PORT", 5000))
+    debug = os.getenv("NODE_ENV", "development") == "development"
+
     print(f"🚀 Mental Wellness Coach Flask API starting on port {port}")
     print(f"📊 Health check: http://localhost:{port}/health")
     print(f"🌍 Environment: {os.getenv('NODE_ENV', 'development')}")
-    print(f"🐍 Framework: Flask (Python)")
-    print(f"🗃️ Database: SQLite")
-    
-    app.run(host='0.0.0.0', port=port, debug=debug) 
\ No newline at end of file
+    print("🐍 Framework: Flask (Python)")
+    print("🗃️ Database: SQLite")
+
+    if debug:
+        # The Werkzeug server is for local development only; outside it run
+        # `gunicorn -w 1 -k gthread --threads 4 app:app`
+        app.run(host="0.0.0.0", port=port, debug=debug)
+    else:
+        try:
+            run_gunicorn(app, port)
+        except ImportError:
+            # gunicorn is unavailable on Windows
+            print("⚠️ gunicorn not installed, falling back to the Werkzeug server")
+            app.run(host="0.0.0.0", port=port, threaded=True)
@@ -4,9 +4,75 @@ Mental Wellness Coach - Database Configuration
 This module contains the SQLAlchemy database instance to prevent circular imports.
 """
 
-from flask_sqlalchemy import SQLAlchemy
+import json
+import sqlite3
+
 from flask_migrate import Migrate
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    # Fallback to the standard library json module when orjson is not available
+    orjson = None
+    HAS_ORJSON = False
+
+
+def _reject_json_value(obj):
+    """Reject values the standard library json module cannot encode either."""
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_serializer(value):
+    """Encode values for JSON columns."""
+    if HAS_ORJSON:
+        # orjson would encode datetimes natively; pass them through so they fail like json.dumps
+        return orjson.dumps(
+            value,
+            default=_reject_json_value,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode()
+    return json.dumps(value)
+
+
+def json_deserializer(text):
+    """Decode values from JSON columns."""
+    return orjson.loads(text) if HAS_ORJSON else json.loads(text)
+
 
 # Initialize extensions here to avoid circular imports
-db = SQLAlchemy()
-migrate = Migrate() 
\ No newline at end of file
+db = SQLAlchemy(
+    engine_options={
+        "json_serializer": json_serializer,
+        "json_deserializer": json_deserializer,
+    }
+)
+migrate = Migrate()
+
+# SQLite tuning: WAL lets readers proceed during writes, NORMAL sync is safe under WAL,
+# and temp tables, mmap and a 64MB page cache keep hot data in memory
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to each new SQLite connection."""
+    # The engine is built lazily per app, so listen on the Engine class and skip other drivers
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
@@ -5,195 +5,238 @@ SQLAlchemy models for SQLite database.
 """
 
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-import json
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from werkzeug.security import check_password_hash, generate_password_hash
 
 # Import the shared db instance from database instead of app to avoid circular imports
 from database import db
 
+# Unbound isoformat for to_dict, skipping the per-row bound-method lookup
+_isoformat = datetime.isoformat
+
+
 class User(db.Model):
     """User model for authentication and profile management."""
-    __tablename__ = 'users'
-    
+
+    __tablename__ = "users"
+
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
     is_active = db.Column(db.Boolean, default=True)
-    
+
     # Relationships
-    mood_entries = db.relationship('MoodEntry', backref='user', lazy=True, cascade='all, delete-orphan')
-    conversations = db.relationship('Conversation', backref='user', lazy=True, cascade='all, delete-orphan')
-    journal_entries = db.relationship('JournalEntry', backref='user', lazy=True, cascade='all, delete-orphan')
-    
+    mood_entries = db.relationship(
+        "MoodEntry", backref="user", lazy=True, cascade="all, delete-orphan"
+    )
+    conversations = db.relationship(
+        "Conversation", backref="user", lazy=True, cascade="all, delete-orphan"
+    )
+    journal_entries = db.relationship(
+        "JournalEntry", backref="user", lazy=True, cascade="all, delete-orphan"
+    )
+
     def set_password(self, password):
         """Set password hash."""
         self.password_hash = generate_password_hash(password)
-    
+
     def check_password(self, password):
         """Check password against hash."""
         return check_password_hash(self.password_hash, password)
-    
+
     def to_dict(self):
         """Convert user to dictionary."""
         return {
-            'id': self.id,
-            'email': self.email,
-            'name': self.name,
-            'created_at': self.created_at.isoformat(),
-            'is_active': self.is_active
+            "id": self.id,
+            "email": self.email,
+            "name": self.name,
+            "created_at": _isoformat(self.created_at),
+            "is_active": self.is_active,
         }
 
+
 class MoodEntry(db.Model):
     """Mood tracking entries."""
-    __tablename__ = 'mood_entries'
-    
+
+    __tablename__ = "mood_entries"
+    __table_args__ = (
+        db.Index("ix_mood_user_created", "user_id", db.text("created_at DESC")),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     mood_score = db.Column(db.Integer, nullable=False)  # 1-10 scale
-    emotions = db.Column(db.Text)  # JSON array of emotions
+    emotions = db.Column(db.JSON(none_as_null=True))  # JSON array of emotions
     energy = db.Column(db.Integer)  # 1-10 scale
     stress = db.Column(db.Integer)  # 1-10 scale
     sleep = db.Column(db.Integer)  # 1-10 scale
     description = db.Column(db.Text)
-    triggers = db.Column(db.Text)  # JSON array of triggers
+    triggers = db.Column(db.JSON(none_as_null=True))  # JSON array of triggers
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def set_emotions(self, emotions_list):
-        """Set emotions as JSON string."""
-        self.emotions = json.dumps(emotions_list) if emotions_list else None
-    
-    def get_emotions(self):
-        """Get emotions as list."""
-        return json.loads(self.emotions) if self.emotions else []
-    
-    def set_triggers(self, triggers_list):
-        """Set triggers as JSON string."""
-        self.triggers = json.dumps(triggers_list) if triggers_list else None
-    
-    def get_triggers(self):
-        """Get triggers as list."""
-        return json.loads(self.triggers) if self.triggers else []
-    
+
     def to_dict(self):
         """Convert mood entry to dictionary."""
         return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'mood_score': self.mood_score,
-            'emotions': self.get_emotions(),
-            'energy': self.energy,
-            'stress': self.stress,
-            'sleep': self.sleep,
-            'description': self.description,
-            'triggers': self.get_triggers(),
-            'created_at': self.created_at.isoformat()
+            "id": self.id,
+            "user_id": self.user_id,
+            "mood_score": self.mood_score,
+            "emotions": self.emotions or [],
+            "energy": self.energy,
+            "stress": self.stress,
+            "sleep": self.sleep,
+            "description": self.description,
+            "triggers": self.triggers or [],
+            "created_at": _isoformat(self.created_at),
         }
 
+
 class Conversation(db.Model):
     """AI conversation sessions."""
-    __tablename__ = 'conversations'
-    
+
+    __tablename__ = "conversations"
+
     id = db.Column(db.Integer, primary_key=True)
-    external_id = db.Column(db.String(100), unique=True, nullable=False, index=True)  # For API references
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    external_id = db.Column(
+        db.String(100), unique=True, nullable=False, index=True
+    )  # For API references
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     title = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    # Maintained by the Message insert/delete listeners so listings don't load every message
+    message_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+
     # Relationships
-    messages = db.relationship('Message', backref='conversation', lazy=True, cascade='all, delete-orphan')
-    
+    messages = db.relationship(
+        "Message",
+        backref="conversation",
+        lazy=True,
+        cascade="all, delete-orphan",
+        order_by=lambda: (Message.created_at, Message.id),
+    )
+
     def to_dict(self):
         """Convert conversation to dictionary."""
         return {
-            'id': self.external_id,
-            'title': self.title,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'message_count': len(self.messages)
+            "id": self.external_id,
+            "title": self.title,
+            "created_at": _isoformat(self.created_at),
+            "updated_at": _isoformat(self.updated_at),
+            "message_count": self.message_count,
         }
 
+
 class Message(db.Model):
     """Individual messages in conversations."""
-    __tablename__ = 'messages'
-    
+
+    __tablename__ = "messages"
+    __table_args__ = (db.Index("ix_msg_conv_created", "conversation_id", "created_at"),)
+
     id = db.Column(db.Integer, primary_key=True)
-    conversation_id = db.Column(db.Integer, db.ForeignKey('conversations.id'), nullable=False)
+    conversation_id = db.Column(
+        db.Integer, db.ForeignKey("conversations.id"), nullable=False
+    )
     role = db.Column(db.String(20), nullable=False)  # 'user' or 'assistant'
     content = db.Column(db.Text, nullable=False)
-    message_metadata = db.Column(db.Text)  # JSON for crisis_level, confidence, etc.
+    message_metadata = db.Column(
+        db.JSON(none_as_null=True)
+    )  # JSON for crisis_level, confidence, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
-    def set_metadata(self, metadata_dict):
-        """Set metadata as JSON string."""
-        self.message_metadata = json.dumps(metadata_dict) if metadata_dict else None
-    
-    def get_metadata(self):
-        """Get metadata as dictionary."""
-        return json.loads(self.message_metadata) if self.message_metadata else {}
-    
+
     def to_dict(self):
         """Convert message to dictionary."""
         return {
-            'id': f"msg_{self.id}",
-            'role': self.role,
-            'content': self.content,
-            'metadata': self.get_metadata(),
-            'timestamp': self.created_at.isoformat()
+            "id": f"msg_{self.id}",
+            "role": self.role,
+            "content": self.content,
+            "metadata": self.message_metadata or {},
+            "timestamp": _isoformat(self.created_at),
         }
 
+
+def _adjust_message_count(connection, message, delta):
+    """Apply a message insert/delete to its conversation's message_count."""
+    conversations = Conversation.__table__
+    connection.execute(
+        conversations.update()
+        .where(conversations.c.id == message.conversation_id)
+        .values(message_count=conversations.c.message_count + delta)
+    )
+
+    # Keep an already-loaded conversation in step without a refresh
+    session = object_session(message)
+    if session is None:
+        return
+    conversation = session.identity_map.get(
+        session.identity_key(Conversation, message.conversation_id)
+    )
+    if conversation is not None and "message_count" in conversation.__dict__:
+        set_committed_value(
+            conversation, "message_count", conversation.message_count + delta
+        )
+
+
+@event.listens_for(Message, "after_insert")
+def _message_inserted(mapper, connection, message):
+    _adjust_message_count(connection, message, 1)
+
+
+@event.listens_for(Message, "after_delete")
+def _message_deleted(mapper, connection, message):
+    _adjust_message_count(connection, message, -1)
+
+
 class JournalEntry(db.Model):
     """Journaling entries."""
-    __tablename__ = 'journal_entries'
-    
+
+    __tablename__ = "journal_entries"
+    __table_args__ = (
+        db.Index("ix_journal_user_created", "user_id", db.text("created_at DESC")),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     title = db.Column(db.String(200))
     content = db.Column(db.Text, nullable=False)
     mood_score = db.Column(db.Integer)  # Optional mood at time of writing
-    emotions = db.Column(db.Text)  # JSON array of emotions
-    tags = db.Column(db.Text)  # JSON array of tags
+    emotions = db.Column(db.JSON(none_as_null=True))  # JSON array of emotions
+    tags = db.Column(db.JSON(none_as_null=True))  # JSON array of tags
     is_private = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def set_emotions(self, emotions_list):
-        """Set emotions as JSON string."""
-        self.emotions = json.dumps(emotions_list) if emotions_list else None
-    
-    def get_emotions(self):
-        """Get emotions as list."""
-        return json.loads(self.emotions) if self.emotions else []
-    
-    def set_tags(self, tags_list):
-        """Set tags as JSON string."""
-        self.tags = json.dumps(tags_list) if tags_list else None
-    
-    def get_tags(self):
-        """Get tags as list."""
-        return json.loads(self.tags) if self.tags else []
-    
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
     def to_dict(self):
         """Convert journal entry to dictionary."""
         return {
-            'id': self.id,
-            'title': self.title,
-            'content': self.content,
-            'mood_score': self.mood_score,
-            'emotions': self.get_emotions(),
-            'tags': self.get_tags(),
-            'is_private': self.is_private,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            "id": self.id,
+            "title": self.title,
+            "content": self.content,
+            "mood_score": self.mood_score,
+            "emotions": self.emotions or [],
+            "tags": self.tags or [],
+            "is_private": self.is_private,
+            "created_at": _isoformat(self.created_at),
+            "updated_at": _isoformat(self.updated_at),
         }
 
+
 class CopingActivity(db.Model):
     """Coping activities and user engagement."""
-    __tablename__ = 'coping_activities'
-    
+
+    __tablename__ = "coping_activities"
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -202,51 +245,63 @@ class CopingActivity(db.Model):
     instructions = db.Column(db.Text)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+
     def to_dict(self):
         """Convert coping activity to dictionary."""
         return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'category': self.category,
-            'duration_minutes': self.duration_minutes,
-            'instructions': self.instructions
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "category": self.category,
+            "duration_minutes": self.duration_minutes,
+            "instructions": self.instructions,
         }
 
+
 class ActivityLog(db.Model):
     """User engagement with coping activities."""
-    __tablename__ = 'activity_logs'
-    
+
+    __tablename__ = "activity_logs"
+    __table_args__ = (
+        db.Index("ix_activity_user_completed", "user_id", db.text("completed_at DESC")),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    activity_id = db.Column(db.Integer, db.ForeignKey('coping_activities.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    activity_id = db.Column(
+        db.Integer, db.ForeignKey("coping_activities.id"), nullable=False
+    )
     duration_minutes = db.Column(db.Integer)
     effectiveness_rating = db.Column(db.Integer)  # 1-10 scale
     notes = db.Column(db.Text)
     completed_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+
     # Relationships
-    user = db.relationship('User', backref='activity_logs')
-    activity = db.relationship('CopingActivity', backref='usage_logs')
-    
+    user = db.relationship("User", backref="activity_logs")
+    activity = db.relationship("CopingActivity", backref="usage_logs")
+
     def to_dict(self):
         """Convert activity log to dictionary."""
         return {
-            'id': self.id,
-            'activity': self.activity.to_dict() if self.activity else None,
-            'duration_minutes': self.duration_minutes,
-            'effectiveness_rating': self.effectiveness_rating,
-            'notes': self.notes,
-            'completed_at': self.completed_at.isoformat()
+            "id": self.id,
+            "activity": self.activity.to_dict() if self.activity else None,
+            "duration_minutes": self.duration_minutes,
+            "effectiveness_rating": self.effectiveness_rating,
+            "notes": self.notes,
+            "completed_at": _isoformat(self.completed_at),
         }
 
+
 class CrisisEvent(db.Model):
     """Crisis detection and intervention tracking."""
-    __tablename__ = 'crisis_events'
-    
+
+    __tablename__ = "crisis_events"
+    __table_args__ = (
+        db.Index("ix_crisis_user_created", "user_id", db.text("created_at DESC")),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     trigger_source = db.Column(db.String(50))  # 'chat', 'mood', 'journal'
     crisis_level = db.Column(db.String(20))  # 'low', 'medium', 'high', 'critical'
     trigger_content = db.Column(db.Text)  # The content that triggered detection
@@ -256,32 +311,39 @@ class CrisisEvent(db.Model):
     user_response = db.Column(db.Text)  # User's response to intervention
     resolved_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+
     # Relationships
-    user = db.relationship('User', backref='crisis_events')
-    
+    user = db.relationship("User", backref="crisis_events")
+
     def to_dict(self):
         """Convert crisis event to dictionary."""
         return {
-            'id': self.id,
-            'trigger_source': self.trigger_source,
-            'crisis_level': self.crisis_level,
-            'trigger_content': self.trigger_content,
-            'ai_confidence': self.ai_confidence,
-            'intervention_taken': self.intervention_taken,
-            'professional_notified': self.professional_notified,
-            'user_response': self.user_response,
-            'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None,
-            'created_at': self.created_at.isoformat()
+            "id": self.id,
+            "trigger_source": self.trigger_source,
+            "crisis_level": self.crisis_level,
+            "trigger_content": self.trigger_content,
+            "ai_confidence": self.ai_confidence,
+            "intervention_taken": self.intervention_taken,
+            "professional_notified": self.professional_notified,
+            "user_response": self.user_response,
+            "resolved_at": _isoformat(self.resolved_at) if self.resolved_at else None,
+            "created_at": _isoformat(self.created_at),
         }
 
+
 class MindfulnessSession(db.Model):
     """Mindfulness and meditation session tracking."""
-    __tablename__ = 'mindfulness_sessions'
-    
+
+    __tablename__ = "mindfulness_sessions"
+    __table_args__ = (
+        db.Index("ix_mindfulness_user_created", "user_id", db.text("created_at DESC")),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    session_type = db.Column(db.String(50), nullable=False)  # 'breathing', 'meditation', 'body_scan', 'progressive_relaxation'
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    session_type = db.Column(
+        db.String(50), nullable=False
+    )  # 'breathing', 'meditation', 'body_scan', 'progressive_relaxation'
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     duration_minutes = db.Column(db.Integer, nullable=False)
@@ -293,93 +355,138 @@ class MindfulnessSession(db.Model):
     stress_before = db.Column(db.Integer)  # 1-10 scale
     stress_after = db.Column(db.Integer)  # 1-10 scale
     notes = db.Column(db.Text)
-    session_data = db.Column(db.Text)  # JSON for session-specific data (breathing patterns, etc.)
+    session_data = db.Column(
+        db.JSON(none_as_null=True)
+    )  # JSON for session-specific data (breathing patterns, etc.)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
-    
+
     # Relationships
-    user = db.relationship('User', backref='mindfulness_sessions')
-    
-    def set_session_data(self, data_dict):
-        """Set session data as JSON string."""
-        self.session_data = json.dumps(data_dict) if data_dict else None
-    
-    def get_session_data(self):
-        """Get session data as dictionary."""
-        return json.loads(self.session_data) if self.session_data else {}
-    
+    user = db.relationship("User", backref="mindfulness_sessions")
+
     def to_dict(self):
         """Convert mindfulness session to dictionary."""
         return {
-            'id': self.id,
-            'session_type': self.session_type,
-            'title': self.title,
-            'description': self.description,
-            'duration_minutes': self.duration_minutes,
-            'completed_duration_minutes': self.completed_duration_minutes,
-            'completed': self.completed,
-            'effectiveness_rating': self.effectiveness_rating,
-            'mood_before': self.mood_before,
-            'mood_after': self.mood_after,
-            'stress_before': self.stress_before,
-            'stress_after': self.stress_after,
-            'notes': self.notes,
-            'session_data': self.get_session_data(),
-            'created_at': self.created_at.isoformat(),
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+            "id": self.id,
+            "session_type": self.session_type,
+            "title": self.title,
+            "description": self.description,
+            "duration_minutes": self.duration_minutes,
+            "completed_duration_minutes": self.completed_duration_minutes,
+            "completed": self.completed,
+            "effectiveness_rating": self.effectiveness_rating,
+            "mood_before": self.mood_before,
+            "mood_after": self.mood_after,
+            "stress_before": self.stress_before,
+            "stress_after": self.stress_after,
+            "notes": self.notes,
+            "session_data": self.session_data or {},
+            "created_at": _isoformat(self.created_at),
+            "completed_at": _isoformat(self.completed_at)
+            if self.completed_at
+            else None,
         }
 
+
 # Utility functions for database operations
 def init_database():
     """Initialize database tables."""
     db.create_all()
-    
+
+    # create_all doesn't alter existing tables; add and backfill message_count on older databases
+    conversation_columns = {
+        column["name"] for column in inspect(db.engine).get_columns("conversations")
+    }
+    if "message_count" not in conversation_columns:
+        db.session.execute(
+            db.text(
+                "ALTER TABLE conversations ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+        db.session.execute(
+            db.text(
+                "UPDATE conversations SET message_count = "
+                "(SELECT COUNT(*) FROM messages WHERE messages.conversation_id = conversations.id)"
+            )
+        )
+        db.session.commit()
+
+    # Likewise for indexes added to tables that already existed
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
     # Add default coping activities
     if CopingActivity.query.count() == 0:
         default_activities = [
             {
-                'name': 'Deep Breathing Exercise',
-                'description': 'Calm your mind with focused breathing',
-                'category': 'breathing',
-                'duration_minutes': 5,
-                'instructions': '1. Sit comfortably\n2. Breathe in for 4 counts\n3. Hold for 4 counts\n4. Breathe out for 6 counts\n5. Repeat 10 times'
+                "name": "Deep Breathing Exercise",
+                "description": "Calm your mind with focused breathing",
+                "category": "breathing",
+                "duration_minutes": 5,
+                "instructions": (
+                    "1. Sit comfortably\n2. Breathe in for 4 counts\n3. Hold for 4 counts\n4. "
+                    "Breathe out for 6 counts\n5. Repeat 10 times"
+                ),
             },
             {
-                'name': '5-4-3-2-1 Grounding',
-                'description': 'Ground yourself using your senses',
-                'category': 'mindfulness',
-                'duration_minutes': 3,
-                'instructions': 'Name:\n5 things you can see\n4 things you can touch\n3 things you can hear\n2 things you can smell\n1 thing you can taste'
+                "name": "5-4-3-2-1 Grounding",
+                "description": "Ground yourself using your senses",
+                "category": "mindfulness",
+                "duration_minutes": 3,
+                "instructions": (
+                    "Name:\n5 things you can see\n4 things you can touch\n3 things you can hear\n2 "
+                    "things you can smell\n1 thing you can taste"
+                ),
             },
             {
-                'name': 'Progressive Muscle Relaxation',
-                'description': 'Release tension through muscle relaxation',
-                'category': 'physical',
-                'duration_minutes': 15,
-                'instructions': '1. Start with your toes\n2. Tense each muscle group for 5 seconds\n3. Release and notice the relaxation\n4. Work your way up to your head'
-            }
+                "name": "Progressive Muscle Relaxation",
+                "description": "Release tension through muscle relaxation",
+                "category": "physical",
+                "duration_minutes": 15,
+                "instructions": (
+                    "1. Start with your toes\n2. Tense each muscle group for 5 seconds\n3. Release "
+                    "and notice the relaxation\n4. Work your way up to your head"
+                ),
+            },
         ]
-        
-        for activity_data in default_activities:
-            activity = CopingActivity(**activity_data)
-            db.session.add(activity)
-        
+
+        # One executemany on the table skips per-object ORM unit-of-work overhead
+        db.session.execute(CopingActivity.__table__.insert(), default_activities)
         db.session.commit()
 
+
 def get_user_stats(user_id):
     """Get comprehensive user statistics."""
-    mood_entries = MoodEntry.query.filter_by(user_id=user_id).count()
-    conversations = Conversation.query.filter_by(user_id=user_id).count()
-    journal_entries = JournalEntry.query.filter_by(user_id=user_id).count()
-    crisis_events = CrisisEvent.query.filter_by(user_id=user_id).count()
-    
-    # Calculate average mood score
-    avg_mood = db.session.query(db.func.avg(MoodEntry.mood_score)).filter_by(user_id=user_id).scalar()
-    
-    return {
-        'mood_entries': mood_entries,
-        'conversations': conversations,
-        'journal_entries': journal_entries,
-        'crisis_events': crisis_events,
-        'average_mood': round(avg_mood, 1) if avg_mood else None
-    } 
\ No newline at end of file
+
+    def user_scalar(aggregate, model):
+        return db.select(aggregate).where(model.user_id == user_id).scalar_subquery()
+
+    # One round trip: every statistic is a scalar subquery of a single SELECT
+    stats = (
+        db.session.execute(
+            db.select(
+                user_scalar(db.func.count(MoodEntry.id), MoodEntry).label(
+                    "mood_entries"
+                ),
+                user_scalar(db.func.count(Conversation.id), Conversation).label(
+                    "conversations"
+                ),
+                user_scalar(db.func.count(JournalEntry.id), JournalEntry).label(
+                    "journal_entries"
+                ),
+                user_scalar(db.func.count(CrisisEvent.id), CrisisEvent).label(
+                    "crisis_events"
+                ),
+                user_scalar(db.func.avg(MoodEntry.mood_score), MoodEntry).label(
+                    "average_mood"
+                ),
+            )
+        )
+        .one()
+        ._asdict()
+    )
+
+    avg_mood = stats["average_mood"]
+    stats["average_mood"] = round(avg_mood, 1) if avg_mood else None
+    return stats
@@ -0,0 +1,299 @@
+"""
+Mental Wellness Coach - Conversation Coordinator Tests
+
+Tests for keyword scanning, the per-user session index and conversation handling
+in the coordinator agent.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import agents.conversation_coordinator_agent as coordinator_module
+from agents.conversation_coordinator_agent import (
+    ActiveConversation,
+    ConversationCoordinatorAgent,
+    ConversationState,
+    _scan,
+    create_conversation_coordinator_agent,
+)
+from services.agent_service import AgentMessage
+
+
+@pytest.fixture(params=["ahocorasick", "stdlib"])
+def scan_backend(request, monkeypatch):
+    """Run a test against the Aho-Corasick scan and the stdlib fallback."""
+    if request.param == "ahocorasick" and coordinator_module._KEYWORD_AC is None:
+        pytest.skip("pyahocorasick is not installed")
+    if request.param == "stdlib":
+        monkeypatch.setattr(coordinator_module, "_KEYWORD_AC", None)
+    return request.param
+
+
+class TestKeywordScan:
+    """Test the single-pass keyword scan."""
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "i feel hopelessness every day",
+            "thinking about suicide",
+            "everything feels hopeless",
+            "i might hurt myself",
+            "i just want to end it all",
+        ],
+    )
+    def test_crisis_keywords_are_detected(self, scan_backend, message):
+        """Crisis keywords keep substring matching, including inflected forms."""
+        tags = _scan(message)
+
+        assert "crisis" in tags
+        assert "crisis_detector" in tags
+
+    def test_crisis_detector_only_phrase(self, scan_backend):
+        """'no point' raises the crisis detector but not the escalation tag."""
+        tags = _scan("there is no point anymore")
+
+        assert "crisis_detector" in tags
+        assert "crisis" not in tags
+
+    def test_mood_keywords_match_whole_words(self, scan_backend):
+        """Mood keywords inside longer words are not reported."""
+        assert "sad" not in _scan("the sadness lingers")
+        assert _scan("i am sad today")["sad"] == {"sad"}
+
+    def test_single_message_reports_every_group(self, scan_backend):
+        """One scan reports stress, journaling and mood tags together."""
+        tags = _scan("i'm stressed and want to journal about my mood")
+
+        assert tags["stress"] == {"stressed"}
+        assert tags["high_stress"] == {"stressed"}
+        assert tags["journal"] == {"journal"}
+        assert tags["mood_request"] == {"mood"}
+        assert tags["anxious"] == {"stressed"}
+
+    def test_plain_message_has_no_tags(self, scan_backend):
+        """Messages without keywords produce no tags."""
+        assert _scan("what a lovely afternoon") == {}
+
+    def test_backends_agree(self, monkeypatch):
+        """The Aho-Corasick scan and the stdlib fallback report the same tags."""
+        if coordinator_module._KEYWORD_AC is None:
+            pytest.skip("pyahocorasick is not installed")
+        messages = [
+            "i feel hopeless and stressed about work",
+            "my sadness and anxiety won't stop",
+            "i want to journal about my mood today",
+            "there is no point, i can't go on",
+            "suicidal thoughts keep coming back",
+            "feeling overwhelmed, anxious and sad",
+            "a calm and happy afternoon",
+            "",
+        ]
+        expected = [_scan(message) for message in messages]
+
+        monkeypatch.setattr(coordinator_module, "_KEYWORD_AC", None)
+
+        assert [_scan(message) for message in messages] == expected
+
+
+def make_conversation(user_id, session_id, last_activity=None):
+    """Build an active conversation for the given user and session."""
+    return ActiveConversation(
+        user_id=user_id,
+        session_id=session_id,
+        state=ConversationState.ACTIVE,
+        participating_agents={"conversation_coordinator"},
+        conversation_type="general",
+        last_activity=last_activity or datetime.utcnow(),
+        context_data={},
+    )
+
+
+class TestSessionIndex:
+    """Test the per-user session index."""
+
+    def setup_method(self):
+        """Build a coordinator that only carries the conversation tables."""
+        self.agent = ConversationCoordinatorAgent.__new__(ConversationCoordinatorAgent)
+        self.agent.active_conversations = {}
+        self.agent._sessions_by_user = {}
+        self.agent._latest_session_by_user = {}
+
+    def add(self, conversation):
+        """Register a conversation the way _handle_start_conversation does."""
+        self.agent.active_conversations[conversation.session_id] = conversation
+        self.agent._sessions_by_user.setdefault(conversation.user_id, set()).add(
+            conversation.session_id
+        )
+        self.agent._latest_session_by_user[
+            conversation.user_id
+        ] = conversation.session_id
+
+    def test_find_returns_latest_session(self):
+        """A user with several sessions gets the one that was active last."""
+        now = datetime.utcnow()
+        self.add(make_conversation("user_1", "session_1", now - timedelta(minutes=5)))
+        self.add(make_conversation("user_1", "session_2", now))
+        self.add(make_conversation("user_2", "session_3", now + timedelta(minutes=1)))
+
+        assert self.agent._find_user_conversation("user_1").session_id == "session_2"
+
+    def test_unindexed_session_leaves_user_index(self):
+        """Unindexing a user's only session removes them from the index."""
+        conversation = make_conversation("user_1", "session_4")
+        self.add(conversation)
+
+        self.agent._unindex_session(conversation)
+        del self.agent.active_conversations["session_4"]
+
+        assert "user_1" not in self.agent._sessions_by_user
+        assert "user_1" not in self.agent._latest_session_by_user
+        assert self.agent._find_user_conversation("user_1") is None
+
+    def test_ending_latest_session_falls_back_to_previous(self):
+        """When the latest session is unindexed, the user's other session becomes current."""
+        first = make_conversation("user_1", "session_5")
+        second = make_conversation("user_1", "session_6")
+        self.add(first)
+        self.add(second)
+
+        self.agent._unindex_session(second)
+        del self.agent.active_conversations["session_6"]
+
+        assert self.agent._sessions_by_user["user_1"] == {"session_5"}
+        assert self.agent._latest_session_by_user["user_1"] == "session_5"
+        assert self.agent._find_user_conversation("user_1") is first
+
+
+def make_message(message_type, payload, user_id="user_1", session_id=None):
+    """Build a message addressed to the coordinator."""
+    return AgentMessage(
+        message_type=message_type,
+        sender_agent="test_client",
+        recipient_agent="conversation_coordinator",
+        payload=payload,
+        user_id=user_id,
+        session_id=session_id,
+    )
+
+
+class TestCoordinatorAgent:
+    """Smoke tests for building and driving the coordinator agent."""
+
+    def setup_method(self):
+        """Build an agent that records outgoing messages instead of sending them."""
+        self.agent = create_conversation_coordinator_agent()
+        self.sent = []
+
+        async def record(recipient, message):
+            self.sent.append((recipient, message))
+            return True
+
+        self.agent.send_message_to_agent = record
+
+    def test_agent_constructs(self):
+        """The coordinator builds and registers a callable for every handler."""
+        assert isinstance(self.agent, ConversationCoordinatorAgent)
+        for message_type, method_name in ConversationCoordinatorAgent._HANDLERS:
+            assert callable(self.agent.message_handlers[message_type])
+            assert self.agent.message_handlers[message_type] == getattr(
+                self.agent, method_name
+            )
+
+    def test_conversation_round_trip(self):
+        """A conversation can be started, continued and ended through the handlers."""
+
+        async def run():
+            await self.agent._handle_start_conversation(
+                None,
+                "client",
+                make_message(
+                    "start_conversation",
+                    {
+                        "conversation_type": "general",
+                        "initial_message": "I feel stressed",
+                    },
+                    session_id="session_1",
+                ),
+            )
+            await self.agent._handle_continue_conversation(
+                None,
+                "client",
+                make_message(
+                    "continue_conversation",
+                    {"message": "Still stressed"},
+                    session_id="session_1",
+                ),
+            )
+            await self.agent._handle_end_conversation(
+                None,
+                "client",
+                make_message("end_conversation", {}, session_id="session_1"),
+            )
+
+        asyncio.run(run())
+
+        # Agent insights are produced locally, so only replies to the client go out
+        assert [message.message_type for _, message in self.sent] == [
+            "conversation_started",
+            "conversation_response",
+            "conversation_ended",
+        ]
+        assert {recipient for recipient, _ in self.sent} == {"client"}
+        assert "coping_advisor" in self.sent[0][1].payload["participating_agents"]
+        assert "session_1" not in self.agent.active_conversations
+
+    def test_response_cache_key_covers_agent_insights(self):
+        """Openers with different agent insights never share a cached response."""
+        conversation = make_conversation("user_1", "session_1")
+
+        calm = self.agent._response_cache_key(
+            conversation,
+            "i feel stressed",
+            {"coping_advisor": {"stress_level": "moderate"}},
+        )
+        high = self.agent._response_cache_key(
+            conversation,
+            "i feel stressed",
+            {"coping_advisor": {"stress_level": "high"}},
+        )
+
+        assert calm is not None
+        assert calm != high
+        assert calm == self.agent._response_cache_key(
+            conversation,
+            "i  feel stressed",
+            {"coping_advisor": {"stress_level": "moderate"}},
+        )
+
+    def test_end_conversation_archives_inline_without_worker(self):
+        """Without a running archiver, ended conversations are archived immediately."""
+        archived = []
+
+        async def archive(conversation, ended_at=None):
+            archived.append(conversation.session_id)
+
+        self.agent._archive_conversation = archive
+
+        async def run():
+            await self.agent._handle_start_conversation(
+                None,
+                "client",
+                make_message(
+                    "start_conversation",
+                    {"conversation_type": "general"},
+                    session_id="session_2",
+                ),
+            )
+            await self.agent._handle_end_conversation(
+                None,
+                "client",
+                make_message("end_conversation", {}, session_id="session_2"),
+            )
+
+        asyncio.run(run())
+
+        assert archived == ["session_2"]
+        assert self.agent._archive_queue.empty()
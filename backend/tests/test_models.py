@@ -0,0 +1,219 @@
+"""
+Mental Wellness Coach - Model Tests
+
+Tests for denormalized counters, schema upgrades and user statistics.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy import inspect
+
+from database import db, json_serializer
+from models import (
+    Conversation,
+    CopingActivity,
+    CrisisEvent,
+    JournalEntry,
+    Message,
+    MoodEntry,
+    User,
+    get_user_stats,
+    init_database,
+)
+
+
+@pytest.fixture
+def app():
+    """Create a bare application bound to an in-memory database."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def user(app):
+    """Create a user to own test rows."""
+    user = User(email="test@example.com", name="Test User")
+    user.set_password("testpass123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def make_conversation(user, external_id="conv_1", messages=0):
+    """Create a conversation with the given number of messages."""
+    conversation = Conversation(user_id=user.id, external_id=external_id, title="Chat")
+    db.session.add(conversation)
+    db.session.flush()
+    for index in range(messages):
+        db.session.add(
+            Message(
+                conversation_id=conversation.id, role="user", content=f"message {index}"
+            )
+        )
+    db.session.commit()
+    return conversation
+
+
+class TestMessageCount:
+    """Test the message_count listeners on Message insert and delete."""
+
+    def test_new_conversation_has_no_messages(self, user):
+        """Conversations start with a zero count."""
+        conversation = make_conversation(user)
+
+        assert conversation.message_count == 0
+        assert conversation.to_dict()["message_count"] == 0
+
+    def test_insert_increments_loaded_and_stored_count(self, user):
+        """Inserts update both the loaded conversation and the stored row."""
+        conversation = make_conversation(user, messages=3)
+
+        assert conversation.message_count == 3
+        db.session.expire_all()
+        assert db.session.get(Conversation, conversation.id).message_count == 3
+
+    def test_messages_appended_through_relationship_are_counted(self, user):
+        """Messages added via Conversation.messages go through the same listener."""
+        conversation = Conversation(
+            user_id=user.id, external_id="conv_rel", title="Chat"
+        )
+        conversation.messages.append(Message(role="user", content="hi"))
+        conversation.messages.append(Message(role="assistant", content="hello"))
+        db.session.add(conversation)
+        db.session.commit()
+
+        db.session.expire_all()
+        assert db.session.get(Conversation, conversation.id).message_count == 2
+
+    def test_delete_decrements_count(self, user):
+        """Deleting a message lowers the count."""
+        conversation = make_conversation(user, messages=2)
+
+        db.session.delete(Message.query.first())
+        db.session.commit()
+
+        assert conversation.message_count == 1
+        db.session.expire_all()
+        assert db.session.get(Conversation, conversation.id).message_count == 1
+
+    def test_counts_are_per_conversation(self, user):
+        """A message only changes its own conversation's count."""
+        first = make_conversation(user, "conv_1", messages=2)
+        second = make_conversation(user, "conv_2", messages=1)
+
+        db.session.expire_all()
+        assert db.session.get(Conversation, first.id).message_count == 2
+        assert db.session.get(Conversation, second.id).message_count == 1
+
+
+class TestInitDatabase:
+    """Test schema upgrades applied by init_database."""
+
+    def test_message_count_is_added_and_backfilled(self, user):
+        """Databases created before message_count gain the column with real counts."""
+        first = make_conversation(user, "conv_1", messages=3)
+        second = make_conversation(user, "conv_2", messages=0)
+        db.session.execute(
+            db.text("ALTER TABLE conversations DROP COLUMN message_count")
+        )
+        db.session.commit()
+
+        init_database()
+
+        columns = {
+            column["name"] for column in inspect(db.engine).get_columns("conversations")
+        }
+        assert "message_count" in columns
+        db.session.expire_all()
+        assert db.session.get(Conversation, first.id).message_count == 3
+        assert db.session.get(Conversation, second.id).message_count == 0
+
+    def test_missing_indexes_are_created(self, app):
+        """Indexes declared on existing tables are created if absent."""
+        db.session.execute(db.text("DROP INDEX ix_users_email"))
+        db.session.commit()
+
+        init_database()
+
+        index_names = {
+            index["name"] for index in inspect(db.engine).get_indexes("users")
+        }
+        assert "ix_users_email" in index_names
+
+    def test_default_activities_seeded_once(self, app):
+        """Default coping activities are only inserted into an empty table."""
+        init_database()
+        init_database()
+
+        assert CopingActivity.query.count() == 3
+
+
+class TestUserStats:
+    """Test get_user_stats."""
+
+    def test_stats_for_new_user(self, user):
+        """A user without activity has zero counts and no average mood."""
+        assert get_user_stats(user.id) == {
+            "mood_entries": 0,
+            "conversations": 0,
+            "journal_entries": 0,
+            "crisis_events": 0,
+            "average_mood": None,
+        }
+
+    def test_stats_count_only_the_given_user(self, user):
+        """Every statistic is scoped to the requested user."""
+        other = User(email="other@example.com", name="Other User")
+        other.set_password("testpass123")
+        db.session.add(other)
+        db.session.commit()
+
+        db.session.add_all(
+            [
+                MoodEntry(user_id=user.id, mood_score=4),
+                MoodEntry(user_id=user.id, mood_score=7),
+                MoodEntry(user_id=user.id, mood_score=6),
+                MoodEntry(user_id=other.id, mood_score=1),
+                JournalEntry(user_id=user.id, content="Today was fine"),
+                CrisisEvent(user_id=other.id, crisis_level="high"),
+            ]
+        )
+        db.session.commit()
+        make_conversation(user, "conv_1")
+        make_conversation(user, "conv_2")
+        make_conversation(other, "conv_3")
+
+        assert get_user_stats(user.id) == {
+            "mood_entries": 3,
+            "conversations": 2,
+            "journal_entries": 1,
+            "crisis_events": 0,
+            "average_mood": 5.7,
+        }
+        assert get_user_stats(other.id)["crisis_events"] == 1
+        assert get_user_stats(other.id)["average_mood"] == 1.0
+
+
+class TestJsonSerializer:
+    """Test the JSON column encoder."""
+
+    def test_matches_stdlib_for_plain_values(self):
+        """Plain values encode to the same JSON the stdlib produces."""
+        value = {"tags": ["calm", "tired"], "score": 7, "note": None}
+
+        assert json.loads(json_serializer(value)) == value
+
+    def test_rejects_datetimes(self):
+        """Datetimes are rejected whichever encoder is in use."""
+        with pytest.raises(TypeError):
+            json_serializer({"at": datetime(2026, 1, 1)})
@@ -0,0 +1,44 @@
+"""
+Mental Wellness Coach - Mood Tracker Agent Tests
+
+Tests for mood reading storage, analysis windows and outgoing alerts.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+from agents.mood_tracker_agent import MoodReading, create_mood_tracker_agent
+
+
+class TestMoodAlerts:
+    """Test alerts sent to the conversation coordinator."""
+
+    def setup_method(self):
+        """Build an agent that records outgoing messages instead of sending them."""
+        self.agent = create_mood_tracker_agent()
+        self.sent = []
+
+        async def record(recipient, message):
+            self.sent.append((recipient, message))
+            return True
+
+        self.agent.send_message_to_agent = record
+
+    def test_alert_payload_is_json_serializable(self):
+        """Alerts carry the handler's clock reading as an ISO string."""
+        now = datetime(2026, 1, 5, 12, 30)
+        reading = MoodReading(
+            user_id="user_1", mood_score=2, emotions=["sad"], timestamp=now
+        )
+
+        asyncio.run(
+            self.agent._send_mood_alert(
+                "user_1", reading, {"alerts": ["low_mood"]}, now
+            )
+        )
+
+        recipient, message = self.sent[0]
+        assert recipient == "conversation_coordinator"
+        assert message.payload["timestamp"] == "2026-01-05T12:30:00"
+        json.dumps(message.payload)
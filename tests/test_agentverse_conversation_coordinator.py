@@ -0,0 +1,90 @@
+"""
+Unit tests for the Agentverse conversation coordinator's keyword scanning.
+
+The agent module needs the uAgents framework; these tests are skipped when
+it is not installed.
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("uagents")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "agents"))
+
+import agentverse_conversation_coordinator as coordinator  # noqa: E402
+
+SCAN_BACKENDS = ("hyperscan", "ahocorasick", "stdlib")
+
+@pytest.fixture(params=SCAN_BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test against each keyword scanning backend that is installed."""
+    if request.param == "hyperscan" and coordinator._KEYWORD_HS is None:
+        pytest.skip("hyperscan is not installed")
+    if request.param != "stdlib" and coordinator._KEYWORD_AC is None:
+        pytest.skip("pyahocorasick is not installed")
+    if request.param != "hyperscan":
+        monkeypatch.setattr(coordinator, "_KEYWORD_HS", None)
+    if request.param == "stdlib":
+        monkeypatch.setattr(coordinator, "_KEYWORD_AC", None)
+    coordinator._scan_message_cached.cache_clear()
+    yield request.param
+    coordinator._scan_message_cached.cache_clear()
+
+class TestCrisisKeywordRecall:
+    """Crisis keywords must still match inside longer words."""
+    
+    @pytest.mark.parametrize("message, level", [
+        ("I feel hopelessness every day", "high"),
+        ("such worthlessness", "high"),
+        ("I keep thinking about suicide", "critical"),
+        ("I want to end it all", "critical"),
+        ("I'm so depressed", "medium"),
+        ("What a lovely day", "none"),
+    ])
+    def test_detect_crisis_level(self, backend, message, level):
+        assert coordinator.detect_crisis_level(message) == level
+    
+    def test_crisis_word_inside_longer_word_is_flagged(self, backend):
+        crisis_level, _ = coordinator.analyze_message("the hopelessness is constant")
+        
+        assert crisis_level == "high"
+
+class TestMoodIndicatorMatching:
+    """Mood indicators only count as whole words."""
+    
+    def test_indicator_inside_longer_word_is_ignored(self, backend):
+        _, indicators = coordinator.analyze_message("the sadness lingers")
+        
+        assert indicators["negative"] == ()
+    
+    def test_whole_word_indicators_in_declaration_order(self, backend):
+        _, indicators = coordinator.analyze_message("stressed and sad but hopeful")
+        
+        assert indicators["negative"] == ("sad", "stressed")
+        assert indicators["positive"] == ("hopeful",)
+
+class TestBackendParity:
+    """Every installed backend returns the same analysis as the stdlib scan."""
+    
+    MESSAGES = (
+        "I feel hopeless and stressed about work",
+        "the hopelessness and worthlessness won't lift",
+        "I keep thinking about suicide, I can't go on",
+        "sad, anxious and overwhelmed but still hopeful",
+        "the sadness lingers",
+        "I'm so depressed and tired",
+        "What a lovely, happy, calm day",
+        "",
+    )
+    
+    def test_backends_agree(self, backend, monkeypatch):
+        results = [coordinator.analyze_message(message.lower()) for message in self.MESSAGES]
+        
+        monkeypatch.setattr(coordinator, "_KEYWORD_HS", None)
+        monkeypatch.setattr(coordinator, "_KEYWORD_AC", None)
+        coordinator._scan_message_cached.cache_clear()
+        
+        assert [coordinator.analyze_message(message.lower()) for message in self.MESSAGES] == results
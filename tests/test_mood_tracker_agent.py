@@ -0,0 +1,202 @@
+"""
+Unit tests for the Agentverse mood tracker agent's in-memory storage.
+
+The agent module needs the uAgents framework; these tests are skipped when
+it is not installed.
+"""
+
+import base64
+import importlib.util
+import os
+from collections import deque
+
+import pytest
+
+pytest.importorskip("uagents")
+
+AGENT_PATH = os.path.join(os.path.dirname(__file__), "..", "agents", "mood-tracker-agent.py")
+
+@pytest.fixture(scope="module")
+def mt():
+    """Load mood-tracker-agent.py (not importable by name because of the hyphens)."""
+    spec = importlib.util.spec_from_file_location("mood_tracker_agent", AGENT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_reading(mt, **overrides):
+    """
+    Build a MoodReading with every field passed explicitly.
+    
+    The dataclass __init__ over a uagents Model requires every field and
+    cannot set pydantic's field state, so readings are built with construct().
+    """
+    fields = {
+        "user_id": "test_user",
+        "mood_score": 5,
+        "emotions": [],
+        "energy_level": None,
+        "stress_level": None,
+        "sleep_hours": None,
+        "triggers": None,
+        "notes": None,
+        "timestamp": None,
+    }
+    fields.update(overrides)
+    return mt.MoodReading.construct(**fields)
+
+class TestMoodBufferOrdering:
+    """Readings with back-dated sender timestamps must keep the buffer sorted."""
+    
+    def test_back_dated_reading_is_inserted_in_order(self, mt):
+        buffer = mt.MoodBuffer(capacity=5)
+        for score, timestamp in [(5, 100), (6, 300), (2, 200)]:
+            buffer.append(score, None, None, timestamp)
+        
+        assert list(buffer.scores_since(0)) == [5, 2, 6]
+        assert list(buffer.scores_since(150)) == [2, 6]
+        assert list(buffer.scores_since(250)) == [6]
+    
+    def test_back_dated_reading_evicts_oldest_when_full(self, mt):
+        buffer = mt.MoodBuffer(capacity=3)
+        for score, timestamp in [(5, 100), (6, 200), (7, 300), (2, 150)]:
+            buffer.append(score, None, None, timestamp)
+        
+        assert len(buffer) == 3
+        assert list(buffer.scores_since(0)) == [2, 6, 7]
+        assert buffer.score_sum == 15
+        assert buffer.low_count == 1
+    
+    def test_reading_older_than_full_buffer_is_dropped(self, mt):
+        buffer = mt.MoodBuffer(capacity=2)
+        for score, timestamp in [(5, 100), (6, 200), (1, 50)]:
+            buffer.append(score, None, None, timestamp)
+        
+        assert list(buffer.scores_since(0)) == [5, 6]
+        assert buffer.score_sum == 11
+        assert buffer.low_count == 0
+    
+    def test_appends_after_reorder_keep_ring_order(self, mt):
+        buffer = mt.MoodBuffer(capacity=3)
+        for score, timestamp in [(5, 100), (6, 300), (2, 200), (7, 400), (8, 500)]:
+            buffer.append(score, None, None, timestamp)
+        
+        assert list(buffer.scores_since(0)) == [6, 7, 8]
+        assert list(buffer.scores_since(350)) == [7, 8]
+
+class TestMoodBufferWindow:
+    """scores_since must return the window in order once the ring wraps."""
+    
+    @pytest.fixture
+    def wrapped(self, mt):
+        # Six readings in a ring of four: slots hold [5, 6, 3, 4], oldest at slot 2
+        buffer = mt.MoodBuffer(capacity=4)
+        for timestamp in range(1, 7):
+            buffer.append(timestamp, None, None, timestamp)
+        return buffer
+    
+    @pytest.mark.parametrize("cutoff, expected", [
+        (0, [3, 4, 5, 6]),
+        (3, [3, 4, 5, 6]),
+        (3.5, [4, 5, 6]),
+        (4, [4, 5, 6]),
+        (4.5, [5, 6]),
+        (6, [6]),
+        (7, []),
+    ])
+    def test_window_across_wrap(self, wrapped, cutoff, expected):
+        assert list(wrapped.scores_since(cutoff)) == expected
+    
+    def test_window_after_exact_wrap(self, mt):
+        buffer = mt.MoodBuffer(capacity=3)
+        for timestamp in range(1, 7):
+            buffer.append(timestamp, None, None, timestamp)
+        
+        assert list(buffer.scores_since(0)) == [4, 5, 6]
+        assert list(buffer.scores_since(5)) == [5, 6]
+    
+    def test_window_before_wrap(self, mt):
+        buffer = mt.MoodBuffer(capacity=4)
+        for timestamp in range(1, 4):
+            buffer.append(timestamp, None, None, timestamp)
+        
+        assert list(buffer.scores_since(2)) == [2, 3]
+        assert list(buffer.scores_since(9)) == []
+
+class TestMoodHistoryOrdering:
+    """Annotated readings in mood_history must stay bisectable by timestamp."""
+    
+    def test_back_dated_reading_lands_in_window(self, mt):
+        mt.mood_history["u"] = deque(maxlen=3)
+        mt.mood_timestamps["u"] = deque(maxlen=3)
+        for epoch in (10, 30, 20, 5):
+            mt._record_history("u", epoch, epoch)
+        
+        assert list(mt.mood_timestamps["u"]) == [10, 20, 30]
+        assert list(mt.mood_history["u"]) == [10, 20, 30]
+
+class TestMoodLogPersistence:
+    """Mood logs are opt-in, encrypted, and never written for invalid readings."""
+    
+    @pytest.fixture
+    def log_dir(self, mt, tmp_path, monkeypatch):
+        if not mt.HAS_CRYPTOGRAPHY:
+            pytest.skip("cryptography is not installed")
+        log_dir = str(tmp_path / "logs")
+        monkeypatch.setattr(mt, "MOOD_LOG_DIR", log_dir)
+        monkeypatch.setattr(mt, "MOOD_LOG_KEY", base64.b64encode(os.urandom(32)).decode())
+        monkeypatch.setattr(mt, "_MOOD_LOG_CIPHER", mt._build_mood_log_cipher())
+        for shard in mt._shards:
+            monkeypatch.setattr(shard, "buffers", {})
+        return log_dir
+    
+    def test_logs_disabled_without_key(self, mt, monkeypatch, tmp_path):
+        monkeypatch.setattr(mt, "MOOD_LOG_DIR", str(tmp_path / "logs"))
+        monkeypatch.setattr(mt, "MOOD_LOG_KEY", None)
+        
+        assert mt._build_mood_log_cipher() is None
+    
+    def test_round_trip_is_encrypted(self, mt, log_dir):
+        reading = make_reading(mt, user_id="log_user", mood_score=4, stress_level=8,
+                               notes="private note", timestamp="2026-01-01T00:00:00")
+        mt._append_mood_record("log_user", reading, 0, 1767225600)
+        
+        path, _ = mt._mood_log_path("log_user")
+        with open(path, "rb") as log_file:
+            raw = log_file.read()
+        assert len(raw) == mt._MOOD_LOG_ENTRY_SIZE
+        assert mt._MOOD_RECORD.pack(4, 8, -1, -1, 0, 1767225600) not in raw
+        
+        buffer = mt._load_mood_buffer("log_user")
+        assert list(buffer.scores_since(0)) == [4]
+        assert int(buffer.stress[0]) == 8
+    
+    def test_partial_tail_is_ignored_on_load_and_dropped_on_append(self, mt, log_dir):
+        reading = make_reading(mt, user_id="torn_user", mood_score=6)
+        mt._append_mood_record("torn_user", reading, 0, 1767225600)
+        path, _ = mt._mood_log_path("torn_user")
+        with open(path, "ab") as log_file:
+            log_file.write(b"torn")
+        
+        buffer = mt._load_mood_buffer("torn_user")
+        assert list(buffer.scores_since(0)) == [6]
+        assert os.path.getsize(path) == mt._MOOD_LOG_ENTRY_SIZE + 4
+        
+        mt._append_mood_record("torn_user", make_reading(mt, user_id="torn_user", mood_score=7),
+                               0, 1767225601)
+        assert os.path.getsize(path) == 2 * mt._MOOD_LOG_ENTRY_SIZE
+        assert list(mt._load_mood_buffer("torn_user").scores_since(0)) == [6, 7]
+    
+    @pytest.mark.parametrize("fields", [
+        {"mood_score": 300},
+        {"mood_score": 0},
+        {"mood_score": 5, "stress_level": -3},
+        {"mood_score": 5, "energy_level": 11},
+        {"mood_score": 5, "sleep_hours": 99.0},
+    ])
+    def test_out_of_range_reading_is_rejected(self, mt, log_dir, fields):
+        reading = make_reading(mt, user_id="bad_user", **fields)
+        
+        with pytest.raises(ValueError):
+            mt.store_mood_reading(reading)
+        assert not os.path.exists(mt._mood_log_path("bad_user")[0])